@@ -10,19 +10,21 @@ Usage:
 from __future__ import annotations
 
 import os
-import subprocess
-import sys
 from pathlib import Path
 
 
 ROOT = Path(__file__).resolve().parent
 VENV = ROOT / ".venv"
+PIP_FLAGS = ("--prefer-binary", "--disable-pip-version-check", "--no-input")
 
 
 def ensure_venv(venv_path: Path) -> Path:
     if not venv_path.exists():
+        import venv  # 既存 venv を再利用する通常経路では不要なので遅延 import
+
         print(f"Creating virtualenv at {venv_path}")
-        subprocess.check_call([sys.executable, "-m", "venv", str(venv_path)])
+        # `python -m venv` と同じ既定値で、インタプリタを再起動せずに作成する
+        venv.EnvBuilder(with_pip=True, symlinks=os.name != "nt").create(str(venv_path))
     if os.name == "nt":
         return venv_path / "Scripts" / "python.exe"
     return venv_path / "bin" / "python"
@@ -31,9 +33,17 @@ def ensure_venv(venv_path: Path) -> Path:
 def install_requirements(python: Path) -> None:
     req = ROOT / "requirements.txt"
     if req.exists():
+        import shutil
+        import subprocess
+
         print("Installing requirements from requirements.txt (if needed)...")
-        subprocess.check_call([str(python), "-m", "pip", "install", "--upgrade", "pip", "setuptools", "wheel"])
-        subprocess.check_call([str(python), "-m", "pip", "install", "-r", str(req)])
+        uv = shutil.which("uv")
+        if uv:
+            # uv があれば解決・ダウンロードをそちらに任せる（pip より桁違いに速い）
+            subprocess.check_call([uv, "pip", "install", "--python", str(python), "-r", str(req)])
+            return
+        # pip の起動・インデックス解決を 1 回にまとめる（バージョン確認の通信やソースビルドも避ける）
+        subprocess.check_call([str(python), "-m", "pip", "install", *PIP_FLAGS, "-r", str(req)])
     else:
         print("No requirements.txt found — nothing to install.")
 
@@ -6,11 +6,27 @@ so `from common.drivers import CncDriver` works even when importing from
 
 The original file was missing in the working tree; restored minimal contents
 based on the backup.
+
+Concrete drivers and factories are imported on first attribute access (PEP 562),
+so importing only ``CncDriver`` does not pull in pyserial and the controller modules.
 """
+from importlib import import_module
+from typing import TYPE_CHECKING
+
 from .base import CncDriver
-from .chuo_stage_driver import ChuoDriver
-from .gsc02_stage_driver import GSC02Driver
-from .actual_machine_control import create_actual_driver, create_chuo_driver, create_gsc02_driver
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .actual_machine_control import create_actual_driver, create_chuo_driver, create_gsc02_driver
+    from .chuo_stage_driver import ChuoDriver
+    from .gsc02_stage_driver import GSC02Driver
+
+_LAZY_ATTRS = {
+    "ChuoDriver": ".chuo_stage_driver",
+    "GSC02Driver": ".gsc02_stage_driver",
+    "create_actual_driver": ".actual_machine_control",
+    "create_chuo_driver": ".actual_machine_control",
+    "create_gsc02_driver": ".actual_machine_control",
+}
 
 __all__ = [
     "CncDriver",
@@ -20,3 +36,16 @@ __all__ = [
     "create_chuo_driver",
     "create_gsc02_driver",
 ]
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_ATTRS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value  # 2 回目以降は通常の属性参照で済ませる
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
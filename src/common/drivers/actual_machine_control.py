@@ -113,6 +113,7 @@ def _build_chuo_kwargs(
     write_timeout = _cast_float(cfg.get("write_timeout", 1.0), label="write_timeout")
     accel = _cast_int(cfg.get("qt_accel", cfg.get("accel", 100)), label="qt_accel/accel")
     enable_response = bool(cfg.get("qt_enable_response", True))
+    low_latency = bool(cfg.get("low_latency", True))
 
     return {
         "port": port,
@@ -123,6 +124,7 @@ def _build_chuo_kwargs(
         "mm_to_device": mm_to_device_fn,
         "default_accel": accel,
         "enable_response": enable_response,
+        "low_latency": low_latency,
     }
 
 
@@ -184,7 +186,7 @@ def _build_gsc02_kwargs(
     _optional_cast("timeout", float)
     _optional_cast("write_timeout", float)
 
-    for key in ("rtscts", "encoding", "terminator", "bytesize", "parity", "stopbits"):
+    for key in ("rtscts", "encoding", "terminator", "bytesize", "parity", "stopbits", "low_latency"):
         if cfg.get(key) is not None:
             controller_kwargs[key] = cfg.get(key)
 
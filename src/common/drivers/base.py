@@ -16,6 +16,8 @@ class CncDriver(ABC):
     双方で一貫した表面を提供する。
     """
 
+    # サブクラスが __slots__ を定義した場合に限り、インスタンス辞書を持たせない
+    __slots__ = ()
     axes: tuple[str, ...] = ()
 
     @abstractmethod
@@ -1,8 +1,9 @@
 """中央精機ステージを QTController 経由で制御するドライバ。"""
 from __future__ import annotations
 
+import inspect
 import logging
-from typing import Callable, Dict, Optional
+from typing import Callable, Dict, Optional, Tuple
 
 from .base import CncDriver
 from .qtbmm2_controller import QTController
@@ -11,6 +12,44 @@ LOG = logging.getLogger(__name__)
 
 AxisConverter = Callable[[str, float], int]
 
+_PULSE_CACHE_SIZE = 1024
+
+# move_abs_batch で 1 回の write にまとめる移動コマンド数。低ボーレートでも 1 回の送信が
+# write_timeout 内に収まる量に抑える（9600 bps で 1 行 20 バイト前後 → 約 0.7 秒）。
+_BATCH_LINES = 32
+
+
+def _adapt_converter(fn: Callable[..., float]) -> AxisConverter:
+    """
+    ``mm_to_device`` を ``(axis, mm)`` 形式へ揃える。
+
+    旧形式 ``mm_to_device(mm)`` も受け付ける。引数の数はシグネチャから一度だけ判定し、
+    判定できない場合に限り呼び出し毎の TypeError フォールバックを使う。
+    """
+    try:
+        sig = inspect.signature(fn)
+    except (TypeError, ValueError):
+        sig = None
+    if sig is not None:
+        try:
+            sig.bind("x", 0.0)
+            return fn
+        except TypeError:
+            pass
+        try:
+            sig.bind(0.0)
+            return lambda axis, value: fn(value)
+        except TypeError:
+            pass
+
+    def convert(axis: str, value: float) -> float:
+        try:
+            return fn(axis, value)
+        except TypeError:  # backwards compat: mm_to_device(mm) -> value
+            return fn(value)
+
+    return convert
+
 
 class ChuoDriver(CncDriver):
     """QT-BMM2 互換ステージとシリアル通信するドライバ。"""
@@ -29,6 +68,7 @@ class ChuoDriver(CncDriver):
         mm_to_device: Optional[AxisConverter] = None,
         enable_response: bool = True,
         default_accel: int = 100,
+        low_latency: bool = True,
     ) -> None:
         """
         パラメータ
@@ -45,6 +85,8 @@ class ChuoDriver(CncDriver):
             ``X:1`` による応答有効化。ファームによっては有効化しないと応答が返らない。
         default_accel:
             速度設定時に ``D`` コマンドへ渡す加速度パラメータ。
+        low_latency:
+            接続時に USB シリアル変換器を低レイテンシモードにする（既定で有効）。
         """
 
         super().__init__()
@@ -53,19 +95,24 @@ class ChuoDriver(CncDriver):
             baudrate=baudrate,
             timeout=timeout,
             write_timeout=write_timeout,
+            low_latency=low_latency,
         ).open()
 
         if mm_to_device is not None:
-            self._mm_to_device = mm_to_device
+            self._mm_to_device = _adapt_converter(mm_to_device)
         elif mm_per_pulse and mm_per_pulse > 0:
             self._mm_to_device = lambda axis, value: int(round(value / mm_per_pulse))
         else:
             self._mm_to_device = lambda axis, value: int(round(value))
 
+        # (軸, mm) → パルスのメモ。速度や折り返し点など同じ値が繰り返し変換される。
+        self._pulse_cache: Dict[Tuple[str, float], int] = {}
+
         self._default_accel = int(default_accel)
         self._rapid_speed_mm = None  # type: Optional[float]
         self._cut_speed_mm = None  # type: Optional[float]
         self._current_speed = None  # type: Optional[int]
+        self._current_speed_mm = None  # type: Optional[float]
 
         if enable_response:
             try:
@@ -105,6 +152,30 @@ class ChuoDriver(CncDriver):
         LOG.debug("ChuoDriver.move_abs -> targets=%s feed=%s rapid=%s", targets, feed, rapid)
         self._controller.abs_go(**targets)
 
+    def move_abs_batch(self, points, *, feed: Optional[float] = None, rapid: bool = False) -> None:
+        """
+        XY 絶対座標 [mm] の列 (N, 2) を順に移動する。
+
+        速度設定は先頭で 1 回だけ行い、移動コマンドは ``_BATCH_LINES`` 行ずつ
+        ``QTController.pipeline`` で溜めて 1 回の write で送る。各点の動作は
+        ``move_abs(x=..., y=...)`` を順に呼んだ場合と同じ。
+        """
+        convert = self._convert_mm
+        ax, ay = self.AXIS_MAP["x"], self.AXIS_MAP["y"]
+        # 目標は毎回両軸とも送る。停止・非常停止などドライバを介さない指令や送信失敗があると
+        # 「前回指令した値」は装置の状態とずれるため、変化のない軸も省かない（省くのは速度設定だけ）。
+        targets = [{ax: convert("x", float(x)), ay: convert("y", float(y))} for x, y in points]
+        if not targets:
+            return
+
+        self._apply_speed(feed=feed, rapid=rapid)
+        LOG.debug("ChuoDriver.move_abs_batch -> %d points feed=%s rapid=%s", len(targets), feed, rapid)
+        ctrl = self._controller
+        for start in range(0, len(targets), _BATCH_LINES):
+            with ctrl.pipeline():
+                for target in targets[start : start + _BATCH_LINES]:
+                    ctrl.abs_go(**target)
+
     def set_speed_params(
         self,
         *,
@@ -119,6 +190,7 @@ class ChuoDriver(CncDriver):
         if accel is not None:
             self._default_accel = int(accel)
         self._current_speed = None  # force reapply on next move
+        self._current_speed_mm = None
 
     def close(self) -> None:
         self._controller.close()
@@ -135,12 +207,13 @@ class ChuoDriver(CncDriver):
         elif not rapid and self._cut_speed_mm is not None:
             mm_per_min = self._cut_speed_mm
 
-        if mm_per_min is None:
+        if mm_per_min is None or mm_per_min == self._current_speed_mm:
             return
 
         pulses = max(1, self._convert_mm("x", mm_per_min))  # assume same scaling for both axes
 
         if self._current_speed == pulses:
+            self._current_speed_mm = mm_per_min
             return
 
         for axis in self.AXIS_MAP.values():
@@ -149,10 +222,16 @@ class ChuoDriver(CncDriver):
             except Exception as exc:  # pragma: no cover - hardware specific
                 LOG.warning("Failed to set speed for axis %s: %s", axis, exc)
         self._current_speed = pulses
+        self._current_speed_mm = mm_per_min
 
     def _convert_mm(self, axis: str, value_mm: float) -> int:
-        try:
-            converted = self._mm_to_device(axis, value_mm)
-        except TypeError:  # backwards compat: mm_to_device(mm) -> value
-            converted = self._mm_to_device(value_mm)  # type: ignore[misc]
-        return int(round(converted))
+        key = (axis, value_mm)
+        cache = self._pulse_cache
+        pulses = cache.get(key)
+        if pulses is not None:
+            return pulses
+        pulses = int(round(self._mm_to_device(axis, value_mm)))
+        if len(cache) >= _PULSE_CACHE_SIZE:
+            cache.clear()
+        cache[key] = pulses
+        return pulses
@@ -8,7 +8,11 @@ from __future__ import annotations
 
 import re
 import threading
-from typing import Any, Dict, Optional
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from .serial_latency import enable_low_latency
 
 try:  # pragma: no cover - optional dependency
     import serial  # type: ignore
@@ -16,6 +20,26 @@ except Exception as exc:  # pragma: no cover
     serial = None  # type: ignore[misc]
 
 
+# 区切り前後の空白を取り除いた正規形 "pos1,pos2,A,B,C" に対する厳密なパターン
+_Q_PATTERN = re.compile(r"([+\-]?\d{1,10}),([+\-]?\d{1,10}),([A-Z]),([A-Z]),([A-Z])", re.ASCII)
+_ASCII_WS = " \t\n\r\f\v"
+
+
+@lru_cache(maxsize=256)
+def _parse_q(raw: str) -> Optional[Tuple[int, int, str, str, str]]:
+    """
+    Q: 応答を (pos1, pos2, ack1, ack2, ack3) に分解する。解析できなければ None。
+
+    ポーリング中は停止位置で同じ応答が繰り返し返るため結果をキャッシュする。
+    """
+    fields = raw.replace("\u3001", ",").split(",")
+    match = _Q_PATTERN.fullmatch(",".join([field.strip(_ASCII_WS) for field in fields]))
+    if not match:
+        return None
+    pos1, pos2, ack1, ack2, ack3 = match.groups()
+    return int(pos1), int(pos2), ack1, ack2, ack3
+
+
 class GSC02:
     """OptoSigma GSC-02 ASCII プロトコルの高レベルラッパー。"""
 
@@ -32,6 +56,7 @@ class GSC02:
         parity: str = "N",
         stopbits: int = 1,
         rtscts: bool = True,
+        low_latency: bool = True,
     ) -> None:
         if serial is None:  # pragma: no cover - defensive
             raise RuntimeError("pyserial is required. Please install `pyserial`.")
@@ -41,15 +66,35 @@ class GSC02:
         self.write_timeout = write_timeout
         self.terminator = terminator
         self.encoding = encoding
+        self._term_bytes = terminator.encode(encoding, errors="ignore")
         self.bytesize = bytesize
         self.parity = parity
         self.stopbits = stopbits
+        self.low_latency = low_latency
         self.rtscts = rtscts
 
         self._ser: Optional[serial.Serial] = None  # type: ignore[attr-defined]
-        self._lock = threading.Lock()
+        self._lock = threading.Lock()  # 書き込みと受信順番号の払い出し
+        # 応答は送信順に返るため、書き込み順に番号を振りその順で readline させる。
+        # 読み込み待ちの間も他スレッドは次のコマンドを書き込める。
+        self._read_cond = threading.Condition()
+        self._next_ticket = 0
+        self._serving_ticket = 0
+        self._pipeline = threading.local()
         self._responses_enabled = True
 
+        # M: コマンドの定型部分をエンコード済みで保持し、移動毎は数値部分だけを変換する
+        def enc(text: str) -> bytes:
+            return text.encode(encoding, errors="ignore")
+
+        self._m_prefix: Dict[Tuple[str, str], Tuple[bytes, bytes]] = {
+            (axes, dirs): (
+                (enc(f"M:W{dirs[0]}P"), enc(f"{dirs[1]}P")) if axes == "W" else (enc(f"M:{axes}{dirs}P"), b"")
+            )
+            for axes, dirs in self._VALID_AXES_DIRS
+        }
+        self._go_suffix = self._term_bytes + enc("G") + self._term_bytes
+
     # ------------------------------------------------------------------#
     # コンテキストマネージャ
     # ------------------------------------------------------------------#
@@ -65,6 +110,8 @@ class GSC02:
             stopbits=self.stopbits,
             rtscts=self.rtscts,
         )
+        if self.low_latency:
+            enable_low_latency(self._ser, self.port)
         self._ser.reset_input_buffer()
         self._ser.reset_output_buffer()
         return self
@@ -92,8 +139,7 @@ class GSC02:
         """終端コード付きでコマンド行を送信する。"""
         if not self._ser:
             raise RuntimeError("Serial port is not open")
-        data = (text + self.terminator).encode(self.encoding, errors="ignore")
-        self._ser.write(data)
+        self._ser.write(text.encode(self.encoding, errors="ignore") + self._term_bytes)
         self._ser.flush()
 
     def _readline(self) -> str:
@@ -105,18 +151,70 @@ class GSC02:
 
     def _send(self, line: str, expect_reply: bool = False) -> Optional[str]:
         """コマンドを送信し、必要なら応答を 1 行受信する。"""
+        if not expect_reply:
+            self._write_raw(line.encode(self.encoding, errors="ignore") + self._term_bytes)
+            return None
+        self._flush_pipeline()  # 溜めたコマンドより先に応答待ちのコマンドを送らない
         with self._lock:
             self._writeln(line)
-            if not expect_reply:
-                return None
             if not self._responses_enabled:
                 return ""
+            ticket = self._next_ticket
+            self._next_ticket += 1
+
+        with self._read_cond:
+            while self._serving_ticket != ticket:
+                self._read_cond.wait()
             try:
                 return self._readline()
-            except Exception:
-                if expect_reply:
-                    raise
-                return ""
+            finally:
+                self._serving_ticket += 1
+                self._read_cond.notify_all()
+
+    def _write_raw(self, data: bytes) -> None:
+        """終端込みでエンコード済みのコマンド列を 1 回の write/flush で送信する。"""
+        pending = getattr(self._pipeline, "pending", None)
+        if pending is not None:
+            pending.append(data)
+            return
+        if not self._ser:
+            raise RuntimeError("Serial port is not open")
+        with self._lock:
+            self._ser.write(data)
+            self._ser.flush()
+
+    @contextmanager
+    def pipeline(self) -> Iterator["GSC02"]:
+        """
+        ブロック内の応答なしコマンドを溜め、終了時に 1 回の write/flush で送る。
+
+        応答を待つコマンドが呼ばれた場合は、それまでに溜めた分を先に送信する。
+        ブロックが例外で抜けた場合、溜めた分は送らずに捨てる。状態はスレッド毎に
+        持つため、他スレッドの送信は溜められない。入れ子にした場合は最も外側の
+        ブロックで送信する。
+        """
+        if getattr(self._pipeline, "pending", None) is not None:
+            yield self
+            return
+        self._pipeline.pending = []
+        try:
+            yield self
+        except BaseException:
+            self._pipeline.pending = None
+            raise
+        self._flush_pipeline(end=True)
+
+    def _flush_pipeline(self, *, end: bool = False) -> None:
+        pending = getattr(self._pipeline, "pending", None)
+        if pending is None:
+            return
+        self._pipeline.pending = None
+        try:
+            if pending:
+                self._write_raw(b"".join(pending))
+        finally:
+            if not end:
+                self._pipeline.pending = []
 
     def set_responses(self, enable: bool) -> None:
         """レスポンス読み取りの有効／無効を切り替える。"""
@@ -130,19 +228,38 @@ class GSC02:
         self._validate_axes(axes, plus_minus)
         self._send(f"H:{axes}{plus_minus}", expect_reply=False)
 
+    def home_and_go(self, axes: str, plus_minus: str) -> None:
+        """原点復帰 (H:) と実行 (G) を 1 回の書き込みで送信する。"""
+        self._validate_axes(axes, plus_minus)
+        self._write_raw(f"H:{axes}{plus_minus}".encode(self.encoding, errors="ignore") + self._go_suffix)
+
     def move_rel(self, axes: str, dirs: str, pulses1: int, pulses2: Optional[int] = None) -> None:
         """相対移動 (M:)。W 指定時は2軸分のパルスを指定する。"""
-        self._validate_axes(axes, dirs)
-        if axes in ("1", "2"):
+        self._write_raw(self._move_rel_payload(axes, dirs, pulses1, pulses2) + self._term_bytes)
+
+    def move_rel_and_go(self, axes: str, dirs: str, pulses1: int, pulses2: Optional[int] = None) -> None:
+        """相対移動 (M:) と実行 (G) を 1 回の書き込みで送信する。"""
+        self._write_raw(self._move_rel_payload(axes, dirs, pulses1, pulses2) + self._go_suffix)
+
+    def _move_rel_payload(self, axes: str, dirs: str, pulses1: int, pulses2: Optional[int]) -> bytes:
+        """M: コマンド本体（終端なし）をバイト列で組み立てる。"""
+        try:
+            prefix = self._m_prefix.get((axes, dirs))
+        except TypeError:  # unhashable な指定も検証でメッセージ付きの ValueError にする
+            prefix = None
+        if prefix is None:
+            self._validate_axes(axes, dirs)  # 不正な組は必ずここで ValueError になる
+            raise ValueError(f"invalid axes/dirs: {axes!r}, {dirs!r}")
+        head, mid = prefix
+        if not mid:
             if pulses1 < 0:
                 raise ValueError("pulses must be >= 0")
-            self._send(f"M:{axes}{dirs}P{pulses1}", expect_reply=False)
-        else:
-            if pulses2 is None:
-                raise ValueError("pulses2 required for axes='W'")
-            if pulses1 < 0 or pulses2 < 0:
-                raise ValueError("pulses must be >= 0")
-            self._send(f"M:W{dirs[0]}P{pulses1}{dirs[1]}P{pulses2}", expect_reply=False)
+            return head + str(pulses1).encode("ascii")
+        if pulses2 is None:
+            raise ValueError("pulses2 required for axes='W'")
+        if pulses1 < 0 or pulses2 < 0:
+            raise ValueError("pulses must be >= 0")
+        return head + str(pulses1).encode("ascii") + mid + str(pulses2).encode("ascii")
 
     def jog(self, axes: str, dirs: str) -> None:
         """ジョグ移動 (J:)。方向は '+' または '-' で指定する。"""
@@ -186,11 +303,6 @@ class GSC02:
     # ------------------------------------------------------------------#
     # 状態取得
     # ------------------------------------------------------------------#
-    _Q_PATTERN = re.compile(
-        r"""^\s*([+\-]?\d{1,10})\s*[,\u3001]\s*([+\-]?\d{1,10})\s*[,\u3001]\s*([A-Z])\s*[,\u3001]\s*([A-Z])\s*[,\u3001]\s*([A-Z])\s*$""",
-        re.ASCII,
-    )
-
     def status_raw(self) -> str:
         """Q: の raw 応答文字列を返す。"""
         return self._send("Q:", expect_reply=True) or ""
@@ -198,13 +310,13 @@ class GSC02:
     def status(self) -> Dict[str, Any]:
         """Q: 応答を辞書化して返す。解析できない場合は raw のみ含める。"""
         raw = self.status_raw()
-        match = self._Q_PATTERN.match(raw.replace("、", ","))
-        if not match:
+        parsed = _parse_q(raw)
+        if parsed is None:
             return {"raw": raw}
-        pos1, pos2, ack1, ack2, ack3 = match.groups()
+        pos1, pos2, ack1, ack2, ack3 = parsed
         return {
-            "pos1": int(pos1),
-            "pos2": int(pos2),
+            "pos1": pos1,
+            "pos2": pos2,
             "ack1": ack1,
             "ack2": ack2,
             "ack3": ack3,
@@ -223,13 +335,20 @@ class GSC02:
     # ------------------------------------------------------------------#
     # 内部ヘルパ
     # ------------------------------------------------------------------#
-    @staticmethod
-    def _validate_axes(axes: str, dirs: str) -> None:
-        """軸および方向の表記を検証する。"""
+    _VALID_AXES_DIRS = frozenset(
+        {("1", "+"), ("1", "-"), ("2", "+"), ("2", "-"), ("W", "++"), ("W", "+-"), ("W", "-+"), ("W", "--")}
+    )
+
+    @classmethod
+    def _validate_axes(cls, axes: str, dirs: str) -> None:
+        """軸および方向の表記を検証する。正常系は集合の 1 回の参照で済ませる。"""
+        try:
+            if (axes, dirs) in cls._VALID_AXES_DIRS:
+                return
+        except TypeError:  # unhashable な dirs はメッセージ判定へ回す
+            pass
         if axes not in ("1", "2", "W"):
             raise ValueError("axes must be '1','2','W'")
-        if axes in ("1", "2") and dirs not in ("+", "-"):
+        if axes in ("1", "2"):
             raise ValueError("dirs must be '+' or '-' for single axis")
-        if axes == "W":
-            if not isinstance(dirs, str) or len(dirs) != 2 or any(c not in "+-" for c in dirs):
-                raise ValueError("dirs for axes='W' must be two chars like '+-'")
+        raise ValueError("dirs for axes='W' must be two chars like '+-'")
@@ -2,7 +2,7 @@
 from __future__ import annotations
 
 import logging
-from typing import Dict, Optional, Mapping
+from typing import Dict, Optional, Mapping, Tuple
 
 from .base import CncDriver
 from .gsc02_controller import GSC02
@@ -15,6 +15,24 @@ class GSC02Driver(CncDriver):
 
     axes = ("x", "y")
     AXIS_NAMES = {"x": "1", "y": "2"}
+    # 移動経路で使う軸コード（AXIS_NAMES と同じ値）
+    _X_CODE = "1"
+    _Y_CODE = "2"
+    # (x >= 0, y >= 0) → W 指定時の方向文字列
+    _DIR_TABLE = {(True, True): "++", (True, False): "+-", (False, True): "-+", (False, False): "--"}
+
+    __slots__ = (
+        "_controller",
+        "_responses_enabled",
+        "_mm_per_pulse",
+        "_home_dirs",
+        "_positions_pulse",
+        "_default_accel",
+        "_rapid_speed_mm",
+        "_cut_speed_mm",
+        "_current_speed",
+        "_last_speed_key",
+    )
 
     def __init__(
         self,
@@ -43,8 +61,7 @@ class GSC02Driver(CncDriver):
         if not isinstance(home_dirs, str) or len(home_dirs) != 2 or any(c not in "+-" for c in home_dirs):
             raise ValueError("home_dirs は '+-' のように '+' または '-' の2文字で指定してください。")
 
-        kwargs = dict(controller_kwargs or {})
-        self._controller = GSC02(port, **kwargs).open()
+        self._controller = (GSC02(port, **controller_kwargs) if controller_kwargs else GSC02(port)).open()
         self._responses_enabled = bool(enable_response)
         self._controller.set_responses(self._responses_enabled)
         self._mm_per_pulse = float(mm_per_pulse)
@@ -54,6 +71,8 @@ class GSC02Driver(CncDriver):
         self._rapid_speed_mm: Optional[float] = None
         self._cut_speed_mm: Optional[float] = None
         self._current_speed: Optional[int] = None
+        # 直前に適用した (feed, rapid)。同じ指定が続く間は速度処理を丸ごと省く。
+        self._last_speed_key: Optional[Tuple[Optional[float], bool]] = None
 
     # ------------------------------------------------------------------#
     # CncDriver interface
@@ -67,40 +86,48 @@ class GSC02Driver(CncDriver):
 
     def home(self) -> None:
         """両軸の原点復帰を行い、内部位置をゼロリセットする。"""
-        self._controller.home("W", self._home_dirs)
-        self._controller.go()
+        self._controller.home_and_go("W", self._home_dirs)
         self._positions_pulse = {"x": 0, "y": 0}
 
     def move_abs(self, *, feed: Optional[float] = None, rapid: bool = False, **axes: float) -> None:
         """絶対座標での移動を相対移動コマンドで実現する。"""
-        deltas: Dict[str, int] = {}
-        targets: Dict[str, int] = {}
-        for logical_axis, mm_value in axes.items():
-            if logical_axis not in self.AXIS_NAMES:
-                continue
-            target = self._convert_mm(mm_value)
-            delta = target - self._positions_pulse[logical_axis]
-            if delta != 0:
-                deltas[logical_axis] = delta
-            targets[logical_axis] = target
-
-        if not deltas:
+        positions = self._positions_pulse
+        x_mm = axes.get("x")
+        y_mm = axes.get("y")
+        tx = positions["x"] if x_mm is None else self._convert_mm(x_mm)
+        ty = positions["y"] if y_mm is None else self._convert_mm(y_mm)
+        dx = tx - positions["x"]
+        dy = ty - positions["y"]
+        if not (dx or dy):
             return
 
-        self._apply_speed(feed, rapid)
+        self._send_move(dx, dy, feed, rapid)
+        positions["x"] = tx
+        positions["y"] = ty
+
+    def move_abs_batch(self, points, *, feed: Optional[float] = None, rapid: bool = False) -> None:
+        """
+        XY 絶対座標 [mm] の列 (N, 2) を順に移動する。
+
+        mm→パルス変換と前点との差分を NumPy で一括計算し、ループではコマンド送信だけを
+        行う。各点の動作は ``move_abs(x=..., y=...)`` を順に呼んだ場合と同じ。
+        """
+        import numpy as np
 
-        if "x" in deltas and "y" in deltas:
-            dirs = "".join("+" if deltas[a] >= 0 else "-" for a in ("x", "y"))
-            self._controller.move_rel("W", dirs, abs(deltas["x"]), abs(deltas["y"]))
-        else:
-            axis = "x" if "x" in deltas else "y"
-            axis_code = self.AXIS_NAMES[axis]
-            direction = "+" if deltas[axis] >= 0 else "-"
-            self._controller.move_rel(axis_code, direction, abs(deltas[axis]))
+        pts = np.asarray(points, dtype=float).reshape(-1, 2)
+        if not len(pts):
+            return
+        targets = np.rint(pts / self._mm_per_pulse).astype(np.int64)
+        start = np.array([[self._positions_pulse["x"], self._positions_pulse["y"]]], dtype=np.int64)
+        deltas = np.diff(np.concatenate((start, targets)), axis=0)
 
-        self._controller.go()
-        for axis, target in targets.items():
-            self._positions_pulse[axis] = target
+        positions = self._positions_pulse
+        for (tx, ty), (dx, dy) in zip(targets.tolist(), deltas.tolist()):
+            if not (dx or dy):
+                continue
+            self._send_move(dx, dy, feed, rapid)
+            positions["x"] = tx
+            positions["y"] = ty
 
     def set_speed_params(
         self,
@@ -119,6 +146,7 @@ class GSC02Driver(CncDriver):
             except Exception as exc:
                 raise SystemExit(f"accel には整数を指定してください: {accel!r}") from exc
         self._current_speed = None
+        self._last_speed_key = None
 
     def close(self) -> None:
         """シリアルポートをクローズする。"""
@@ -127,7 +155,17 @@ class GSC02Driver(CncDriver):
     # ------------------------------------------------------------------#
     # Helpers
     # ------------------------------------------------------------------#
-    def _apply_speed(self, feed: Optional[float], rapid: bool) -> None:
+    def _apply_speed(self, feed: Optional[float], rapid: bool) -> Optional[int]:
+        """
+        必要なら速度設定 (D:) を送る（pipeline 中は溜める）。送った場合はその速度 [pulse/s] を返す。
+
+        D: を出した場合、``_current_speed`` / ``_last_speed_key`` は呼び出し側が書き込み
+        成功後に更新する。
+        """
+        key = (feed, rapid)
+        if key == self._last_speed_key:
+            return None
+
         target_mm: Optional[float] = None
         if feed is not None:
             target_mm = float(feed)
@@ -137,28 +175,57 @@ class GSC02Driver(CncDriver):
             target_mm = self._cut_speed_mm
 
         if target_mm is None:
-            return
+            self._last_speed_key = key
+            return None
 
         pulses = max(1, self._convert_mm(target_mm))
         if self._current_speed == pulses:
-            return
+            self._last_speed_key = key
+            return None
 
         accel = self._default_accel
-        try:
-            self._controller.set_speed(
-                range_id=1,
-                s1=pulses,
-                f1=pulses,
-                r1=accel,
-                s2=pulses,
-                f2=pulses,
-                r2=accel,
-            )
-        except Exception as exc:
-            LOG.warning("GSC02Driver: 速度設定に失敗しました: %s", exc)
-            return
+        self._controller.set_speed(
+            range_id=1,
+            s1=pulses,
+            f1=pulses,
+            r1=accel,
+            s2=pulses,
+            f2=pulses,
+            r2=accel,
+        )
+        return pulses
+
+    def _send_move(self, dx: int, dy: int, feed: Optional[float], rapid: bool) -> None:
+        """
+        パルス差分 (dx, dy) の相対移動を、速度設定 (D:)・移動 (M:)・実行 (G) の 1 回の書き込みで送る。
 
-        self._current_speed = pulses
+        差分 0 の軸は移動しない。両方 0 の場合は呼ばないこと。書き込みに失敗した場合は
+        速度の記録を破棄し、次の移動で D: を送り直す。
+        """
+        controller = self._controller
+        try:
+            with controller.pipeline():
+                pulses = self._apply_speed(feed, rapid)
+
+                if dx and dy:
+                    dirs = self._DIR_TABLE[(dx >= 0, dy >= 0)]
+                    controller.move_rel_and_go("W", dirs, dx if dx >= 0 else -dx, dy if dy >= 0 else -dy)
+                else:
+                    code, delta = (self._X_CODE, dx) if dx else (self._Y_CODE, dy)
+                    if delta > 0:
+                        controller.move_rel_and_go(code, "+", delta)
+                    else:
+                        controller.move_rel_and_go(code, "-", -delta)
+        except Exception:
+            self._current_speed = None
+            self._last_speed_key = None
+            raise
+
+        if pulses is not None:
+            self._current_speed = pulses
+            self._last_speed_key = (feed, rapid)
 
     def _convert_mm(self, value_mm: float) -> int:
+        # 逆数の乗算や +0.5 切り捨てにすると境界値の丸めが move_abs_batch (np.rint) と
+        # 食い違うため、除算 + round() のまま使う。
         return int(round(value_mm / self._mm_per_pulse))
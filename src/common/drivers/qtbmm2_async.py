@@ -0,0 +1,71 @@
+"""QTController を asyncio から使うためのラッパー。
+
+GUI などのイベントループ上で QT-BMM2 を操作すると、応答待ちのたびにループ全体が止まる。
+ここでは送受信を QTController の IO スレッドと 1 本の送信用スレッドへ逃がし、
+コルーチンからは ``await`` で結果だけを受け取れるようにする。
+"""
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Optional
+
+from .qtbmm2_controller import QTController
+
+
+class QTControllerAsync:
+    """
+    QTController の非同期ファサード。
+
+    ``send`` はコマンド行を IO スレッドのキューへ直接積み、応答を ``asyncio.wrap_future``
+    で待つ。移動や入出力などの既存メソッドは ``call`` で専用の 1 スレッドから順に実行する。
+    ``send`` と ``call`` を await せずに混在させた場合、両者の間の送信順は保証しない。
+    ポートの open/close は呼び出し側（ラップする QTController）の責務とする。
+    """
+
+    def __init__(self, controller: QTController, *, max_batch: int = 16) -> None:
+        self._ctrl = controller
+        self._max_batch = max_batch
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    @property
+    def controller(self) -> QTController:
+        return self._ctrl
+
+    def start(self) -> "QTControllerAsync":
+        """IO スレッドと送信用スレッドを起動する。"""
+        self._ctrl.start_io_thread(self._max_batch)
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="QTControllerAsync")
+        return self
+
+    def close(self) -> None:
+        """実行中の呼び出しを待ってからスレッドを止める。"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        self._ctrl.stop_io_thread()
+
+    async def __aenter__(self) -> "QTControllerAsync":
+        return self.start()
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await asyncio.get_running_loop().run_in_executor(None, self.close)
+
+    async def send(self, line: str, expect_reply: Optional[bool] = None) -> Optional[str]:
+        """コマンド行（例: ``"Q:A1"``）を送信し、応答があれば返す。"""
+        if self._executor is None:
+            # 未起動だと submit がイベントループのスレッドで同期的に送受信してしまう
+            raise RuntimeError("QTControllerAsync is not started")
+        return await asyncio.wrap_future(self._ctrl.submit(line, expect_reply))
+
+    async def call(self, method: str, *args: Any, **kwargs: Any) -> Any:
+        """``QTController`` のメソッドを送信用スレッドで呼び、戻り値を返す。"""
+        if self._executor is None:
+            raise RuntimeError("QTControllerAsync is not started")
+        func = getattr(self._ctrl, method)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, lambda: func(*args, **kwargs))
+
+
+__all__ = ["QTControllerAsync"]
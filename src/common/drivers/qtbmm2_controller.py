@@ -16,8 +16,17 @@
 """
 from __future__ import annotations
 
+import os
+import queue
+import select
 import threading
-from typing import Any, Dict, Optional, Tuple, Union
+import time
+from concurrent.futures import Future
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+from .serial_latency import enable_low_latency
 
 try:  # pragma: no cover - optional dependency
     import serial  # type: ignore
@@ -27,19 +36,31 @@ except Exception as exc:  # pragma: no cover
 
 AxisValue = Union[int, float]
 AxesPayload = Dict[str, AxisValue]
+_IORequest = Tuple[bytes, Optional[bool], "Future[Optional[str]]"]
+
+# 1 回の writev に渡せるバッファ数の上限（POSIX の IOV_MAX の一般的な値）
+_IOV_MAX = 1024
 
 
-def _format_axes(axes: AxesPayload) -> str:
-    """``A<値> B<値>`` 形式の文字列を生成する（軸は A→B の順）。
+def _format_axes(axes: AxesPayload) -> bytes:
+    """``A<値> B<値>`` 形式のバイト列を生成する（軸は A→B の順）。
 
     コントローラは軸名を大文字、続いて数値（通常はパルス値）を期待する。
-    軸を省略すると、その軸の設定値は変更されない。
+    軸を省略すると、その軸の設定値は変更されない。移動系コマンドの送信経路で
+    str の連結と再エンコードを挟まないよう、最初からバイト列で組み立てる。
     """
     parts = []
-    for axis in ("A", "B"):
-        if axis in axes and axes[axis] is not None:
-            parts.append(f"{axis}{axes[axis]}")
-    return " ".join(parts)
+    for axis, prefix in (("A", b"A"), ("B", b"B")):
+        value = axes.get(axis)
+        if value is not None:
+            parts.append(prefix + str(value).encode("ascii"))
+    return b" ".join(parts)
+
+
+@lru_cache(maxsize=256)
+def _encode_cmd(letter: str, payload: str, encoding: str) -> bytes:
+    """``<letter>:<payload>`` をエンコードする。X:1 や P:<番号> など繰り返し使う行はキャッシュから返る。"""
+    return f"{letter}:{payload}".encode(encoding, errors="ignore")
 
 
 class QTController:
@@ -49,6 +70,42 @@ class QTController:
     マルチスレッド環境でもコマンドと応答が混線しないよう、内部ロックで排他制御を行う。
     """
 
+    # コマンドヘッダ（``<letter>:``）のエンコード済みバイト列。コマンド名は ASCII のみ。
+    _HEADERS: Dict[str, bytes] = {
+        letter: f"{letter}:".encode("ascii")
+        for letter in (
+            "A", "AGO", "M", "MGO", "G", "B", "BGO", "V", "VGO", "J", "JGO", "H", "L", "W",
+            "D", "P", "Q", "C", "Y", "I", "E", "RESET", "RESTA", "X", "?",
+        )
+    }
+
+    __slots__ = (
+        "port",
+        "baudrate",
+        "timeout",
+        "write_timeout",
+        "terminator",
+        "encoding",
+        "bytesize",
+        "parity",
+        "stopbits",
+        "low_latency",
+        "_term_bytes",
+        "_ser",
+        "_lock",
+        "_pipeline",
+        "_io_queue",
+        "_io_thread",
+        "_io_cond",
+        "_io_stopping",
+        "_io_max_batch",
+        "_fd",
+        "_rx_buf",
+        "_eol",
+        "_query_cache",
+        "_last_outputs",
+    )
+
     def __init__(
         self,
         port: str,
@@ -60,6 +117,7 @@ class QTController:
         bytesize: int = 8,
         parity: str = "N",
         stopbits: int = 1,
+        low_latency: bool = True,
     ) -> None:
         if serial is None:  # pragma: no cover - defensive
             raise RuntimeError("pyserial is required. Please install `pyserial`.")
@@ -69,12 +127,29 @@ class QTController:
         self.write_timeout = write_timeout
         self.terminator = terminator
         self.encoding = encoding
+        self._term_bytes = terminator.encode(encoding, errors="ignore")
         self.bytesize = bytesize
         self.parity = parity
         self.stopbits = stopbits
+        self.low_latency = low_latency
 
         self._ser: Optional[serial.Serial] = None  # type: ignore[attr-defined]
         self._lock = threading.Lock()
+        self._pipeline = threading.local()
+        self._io_queue: Optional["queue.SimpleQueue[Optional[_IORequest]]"] = None
+        self._io_thread: Optional[threading.Thread] = None
+        # _io_queue の参照と投入を IO スレッドの停止と排他にする。停止中の投入は停止完了まで待たせる
+        self._io_cond = threading.Condition()
+        self._io_stopping = False
+        self._io_max_batch = 16
+        self._fd: Optional[int] = None
+        self._rx_buf = bytearray()
+        # pyserial の readline と同じく行末は終端文字列の最後のバイト（CRLF なら LF）で判定する
+        self._eol = self._term_bytes[-1:] or b"\n"
+        # (コマンド, ペイロード) → (取得時刻, 応答)。max_age_ms 指定時のみ参照する
+        self._query_cache: Dict[Tuple[str, str], Tuple[float, str]] = {}
+        # 最後に set_outputs で送った (o1, o2, o3, o4)。不明な場合は None
+        self._last_outputs: Optional[Tuple[int, int, int, int]] = None
 
     # ------------------------------------------------------------------#
     # Context manager helpers
@@ -90,12 +165,27 @@ class QTController:
             parity=self.parity,
             stopbits=self.stopbits,
         )
+        if self.low_latency:
+            enable_low_latency(self._ser, self.port)
+        self._fd = self._posix_fd(self._ser)
         self._ser.reset_input_buffer()
         self._ser.reset_output_buffer()
+        self._rx_buf.clear()
         return self
 
+    @staticmethod
+    def _posix_fd(ser) -> Optional[int]:
+        """POSIX で直接書き込めるファイル記述子を返す。使えない環境では None。"""
+        if os.name != "posix":
+            return None
+        try:
+            return ser.fileno()
+        except (AttributeError, OSError, ValueError):
+            return None
+
     def close(self) -> None:
         """シリアルポートが開いていればフラッシュして閉じる。"""
+        self.stop_io_thread()
         if self._ser:
             try:
                 self._ser.flush()
@@ -103,6 +193,7 @@ class QTController:
                 pass
             self._ser.close()
             self._ser = None
+            self._fd = None
 
     def __enter__(self) -> "QTController":
         return self.open()
@@ -113,39 +204,352 @@ class QTController:
     # ------------------------------------------------------------------#
     # Low-level IO
     # ------------------------------------------------------------------#
-    def _writeln(self, text: str) -> None:
-        """コマンド行（末尾の終端文字込み）を書き出す。"""
+    def _writeln(self, line: bytes) -> None:
+        """エンコード済みのコマンド行に終端文字を付けて書き出す。"""
         if not self._ser:
             raise RuntimeError("Serial port is not open")
-        data = (text + self.terminator).encode(self.encoding, errors="ignore")
-        self._ser.write(data)
-        self._ser.flush()
+        # 送信完了待ち (flush) は応答を読む直前と drain() に限り、OS の送信バッファに任せる
+        self._write_lines((line,))
+
+    def _write_lines(self, lines: Sequence[bytes]) -> None:
+        """
+        各行の後ろに終端文字を付けて書き出す。
+
+        ファイル記述子が使える POSIX では ``os.writev`` で行と終端文字を 1 回のシステムコールに
+        まとめ、連結用の中間バイト列を作らない。書き切れなかった分は ``_write`` で送る。
+        """
+        term = self._term_bytes
+        fd = self._fd
+        if fd is None or not hasattr(os, "writev") or 2 * len(lines) > _IOV_MAX:
+            self._write(term.join(lines) + term)
+            return
+        parts: List[bytes] = []
+        for line in lines:
+            parts.append(line)
+            parts.append(term)
+        try:
+            written = os.writev(fd, parts)
+        except BlockingIOError:
+            written = 0
+        if written < sum(map(len, parts)):
+            self._write(b"".join(parts)[written:])
+
+    def _write(self, data: bytes) -> None:
+        """
+        バイト列を書き込む。
+
+        POSIX では pyserial の write を介さず ``os.write`` でファイル記述子へ直接書き、
+        送信バッファが詰まった場合だけ ``select`` で書き込み可能になるのを待つ。
+        ``write_timeout`` は pyserial と同じく 1 回の書き込み全体に対する上限として扱う。
+        """
+        fd = self._fd
+        if fd is None:
+            self._ser.write(data)
+            return
+        view = memoryview(data)
+        deadline: Optional[float] = None
+        while view:
+            try:
+                written = os.write(fd, view)
+            except BlockingIOError:
+                written = 0
+            if written:
+                view = view[written:]
+                continue
+            wait = self.write_timeout
+            if wait is not None:
+                if deadline is None:
+                    deadline = time.monotonic() + wait
+                wait = max(0.0, deadline - time.monotonic())
+            _, ready, _ = select.select([], [fd], [], wait)
+            if not ready:
+                raise serial.SerialTimeoutException("Write timeout")  # type: ignore[union-attr]
 
     def _readline(self) -> str:
-        """終端文字またはタイムアウトまで読み取り、文字列に復号する。"""
-        if not self._ser:
+        """
+        終端文字またはタイムアウトまで読み取り、文字列に復号する。
+
+        受信済みのバイトは ``_rx_buf`` に溜め、1 バイトずつではなく ``in_waiting`` 分を
+        まとめて読む。行の後ろに続いて届いたデータは次回の応答として残す。
+        """
+        ser = self._ser
+        if not ser:
             raise RuntimeError("Serial port is not open")
-        raw = self._ser.readline()
+        buf = self._rx_buf
+        eol = self._eol
+        start = 0
+        deadline = None if self.timeout is None else time.monotonic() + self.timeout
+        while True:
+            idx = buf.find(eol, start)
+            if idx >= 0:
+                raw = bytes(buf[: idx + 1])
+                del buf[: idx + 1]
+                break
+            start = len(buf)
+            chunk = ser.read(ser.in_waiting or 1)
+            if chunk:
+                buf += chunk
+                continue
+            if deadline is not None and time.monotonic() >= deadline:
+                raw = bytes(buf)  # タイムアウト時は readline と同様に途中までを返す
+                buf.clear()
+                break
         return raw.decode(self.encoding, errors="ignore").strip()
 
-    def _exchange(self, line: str, expect_reply: Optional[bool] = None) -> Optional[str]:
+    def _exchange(self, line: bytes, expect_reply: Optional[bool] = None) -> Optional[str]:
         """1 行送信し、必要ならレスポンスを待つ。"""
+        pending = getattr(self._pipeline, "pending", None)
+        if pending is not None:
+            if expect_reply is False:
+                pending.append(line)
+                return None
+            self._flush_pipeline()  # 溜めたコマンドより先に応答待ちのコマンドを送らない
+        if self._io_queue is not None or self._io_stopping:
+            return self._submit_line(line, expect_reply).result()
         with self._lock:
             self._writeln(line)
             if expect_reply is False:
                 return None
-            try:
-                reply = self._readline()
-                return reply
-            except Exception:
-                if expect_reply:
-                    raise
-                return ""
+            return self._read_reply(expect_reply)
+
+    def _read_reply(self, expect_reply: Optional[bool]) -> str:
+        """送信済みコマンドの応答を 1 行読む。ロック保持中に呼ぶこと。"""
+        self._ser.flush()
+        try:
+            return self._readline()
+        except Exception:
+            if expect_reply:
+                raise
+            return ""
+
+    # ------------------------------------------------------------------#
+    # IO thread
+    # ------------------------------------------------------------------#
+    def start_io_thread(self, max_batch: int = 16) -> None:
+        """
+        送受信を専用スレッドへ移す。
+
+        以後のコマンドはキューへ積まれ、IO スレッドが応答不要のコマンドを最大
+        ``max_batch`` 件まで 1 回の write にまとめて送る。同期 API はそのまま使え、
+        ``submit`` が返す Future は ``asyncio.wrap_future`` で await できる。
+        """
+        with self._io_cond:
+            while self._io_stopping:
+                self._io_cond.wait()
+            if self._io_thread is not None:
+                return
+            self._io_max_batch = max(1, int(max_batch))
+            # 受け渡しは C 実装の SimpleQueue（タスク管理のロックを持たない）で行う
+            io_queue: "queue.SimpleQueue[Optional[_IORequest]]" = queue.SimpleQueue()
+            thread = threading.Thread(
+                target=self._io_loop, args=(io_queue,), name=f"QTController-io-{self.port}", daemon=True
+            )
+            self._io_queue = io_queue
+            self._io_thread = thread
+            thread.start()
+
+    def stop_io_thread(self) -> None:
+        """
+        IO スレッドを止める。キューに残ったコマンドは送信してから終了する。
+
+        停止を始めた時点で以後の投入はキューへ積まず、停止完了を待ってから同期送信に回す。
+        IO スレッドが処理しきれなかった要求は呼び出し元のスレッドで送信する。
+        """
+        with self._io_cond:
+            thread, io_queue = self._io_thread, self._io_queue
+            if thread is None or io_queue is None:
+                return
+            self._io_queue = None
+            self._io_stopping = True
+        try:
+            io_queue.put(None)
+            thread.join()
+            while True:
+                try:
+                    item = io_queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is not None:
+                    self._io_run_batch([item])
+        finally:
+            with self._io_cond:
+                self._io_thread = None
+                self._io_stopping = False
+                self._io_cond.notify_all()
+
+    def submit(self, line: str, expect_reply: Optional[bool] = None) -> "Future[Optional[str]]":
+        """
+        コマンド行（例: ``"AGO:A100"``）を送信し、応答を受け取る Future を返す。
+
+        IO スレッドが動いていない場合は同期的に送受信し、完了済みの Future を返す。
+        """
+        self._invalidate_query_cache()
+        self._last_outputs = None
+        return self._submit_line(line.encode(self.encoding, errors="ignore"), expect_reply)
+
+    def _submit_line(self, line: bytes, expect_reply: Optional[bool]) -> "Future[Optional[str]]":
+        fut: "Future[Optional[str]]" = Future()
+        with self._io_cond:
+            while self._io_stopping:
+                self._io_cond.wait()
+            io_queue = self._io_queue
+            if io_queue is not None:
+                io_queue.put((line, expect_reply, fut))
+                return fut
+        try:
+            fut.set_result(self._exchange(line, expect_reply))
+        except Exception as exc:
+            fut.set_exception(exc)
+        return fut
+
+    def _io_loop(self, io_queue: "queue.SimpleQueue[Optional[_IORequest]]") -> None:
+        stop = False
+        while not stop:
+            item = io_queue.get()
+            if item is None:
+                break
+            batch = [item]
+            # 応答不要のコマンドが続く間はまとめて書く（応答待ちはバッチの末尾にだけ来る）
+            while len(batch) < self._io_max_batch and batch[-1][1] is False:
+                try:
+                    nxt = io_queue.get_nowait()
+                except queue.Empty:
+                    break
+                if nxt is None:
+                    stop = True
+                    break
+                batch.append(nxt)
+            self._io_run_batch(batch)
+
+    def _io_run_batch(self, batch: List["_IORequest"]) -> None:
+        batch = [req for req in batch if req[2].set_running_or_notify_cancel()]
+        if not batch:
+            return
+        futures = [fut for _, _, fut in batch]
+        try:
+            with self._lock:
+                if not self._ser:
+                    raise RuntimeError("Serial port is not open")
+                self._write_lines([line for line, _, _ in batch])
+                _, expect_reply, last = batch[-1]
+                reply = None if expect_reply is False else self._read_reply(expect_reply)
+        except Exception as exc:
+            for fut in futures:
+                if not fut.done():
+                    fut.set_exception(exc)
+            return
+        for fut in futures:
+            if not fut.done():
+                fut.set_result(reply if fut is last else None)
+
+    def _invalidate_query_cache(self) -> None:
+        """状態を変えうるコマンドを送る前に、問い合わせ結果のキャッシュを捨てる。"""
+        if self._query_cache:
+            self._query_cache.clear()
+
+    def send_batch(self, lines: Sequence[str], expect_reply: bool = False) -> Optional[List[str]]:
+        """
+        複数コマンドを 1 回の write/flush で送信する。
+
+        ``expect_reply=True`` の場合は送信後に各コマンドの応答を順に 1 行ずつ読み、
+        リストで返す。pipeline 中に呼んだ場合は、それまでに溜めた分を先に送信する。
+        """
+        self._invalidate_query_cache()
+        self._last_outputs = None
+        self._flush_pipeline()
+        encoding = self.encoding
+        return self._send_lines([line.encode(encoding, errors="ignore") for line in lines], expect_reply)
+
+    def _send_lines(self, lines: Sequence[bytes], expect_reply: bool = False) -> Optional[List[str]]:
+        if not lines:
+            return [] if expect_reply else None
+        if not self._ser:
+            raise RuntimeError("Serial port is not open")
+        if self._io_queue is not None or self._io_stopping:
+            # IO スレッド稼働中はポートへの読み書きを IO スレッドだけに任せ、呼び出し側は Future で待つ
+            futures = [self._submit_line(line, True if expect_reply else False) for line in lines]
+            results = [fut.result() or "" for fut in futures]
+            return results if expect_reply else None
+        with self._lock:
+            self._write_lines(lines)
+            if not expect_reply:
+                return None
+            self._ser.flush()
+            return [self._readline() for _ in lines]
+
+    def drain(self) -> None:
+        """書き込み済みのコマンドが送信し終わるまで待つ。"""
+        if not self._ser:
+            raise RuntimeError("Serial port is not open")
+        with self._lock:
+            self._ser.flush()
+
+    def _send_immediate(self, letter: str) -> None:
+        """pipeline 中でも溜めずに即時送信し、送信完了まで待つ（停止・リセット用）。"""
+        self._invalidate_query_cache()
+        self._last_outputs = None
+        with self._lock:
+            self._writeln(self._HEADERS[letter])
+            self._ser.flush()
+
+    @contextmanager
+    def pipeline(self) -> Iterator["QTController"]:
+        """
+        ブロック内の応答なしコマンドを溜め、終了時に ``send_batch`` でまとめて送る。
+
+        応答を読むコマンドが呼ばれた場合は、それまでに溜めた分を先に送信する。
+        ブロックが例外（Ctrl-C を含む）で抜けた場合、溜めた分は送らずに捨てる。
+        状態はスレッド毎に持ち、入れ子にした場合は最も外側のブロックで送信する。
+        """
+        if getattr(self._pipeline, "pending", None) is not None:
+            yield self
+            return
+        self._pipeline.pending = []
+        try:
+            yield self
+        except BaseException:
+            self._pipeline.pending = None
+            raise
+        self._flush_pipeline(end=True)
+
+    def _flush_pipeline(self, *, end: bool = False) -> None:
+        pending = getattr(self._pipeline, "pending", None)
+        if pending is None:
+            return
+        self._pipeline.pending = None
+        try:
+            self._send_lines(pending)
+        finally:
+            if not end:
+                self._pipeline.pending = []
 
     def _cmd(self, letter: str, payload: str = "", expect_reply: Optional[bool] = None) -> Optional[str]:
-        line = f"{letter}:{payload}" if payload else f"{letter}:"
+        if expect_reply is not True:
+            self._invalidate_query_cache()
+        line = _encode_cmd(letter, payload, self.encoding) if payload else self._HEADERS[letter]
         return self._exchange(line, expect_reply=expect_reply)
 
+    def _query(self, letter: str, payload: str, max_age_ms: float) -> str:
+        """
+        問い合わせコマンドを送り、応答を返す。
+
+        ``max_age_ms`` > 0 の場合、同じ問い合わせの応答がその時間内に得られていれば
+        送信せずに再利用する。状態を変えるコマンドを送るとキャッシュは破棄される。
+        """
+        key = (letter, payload)
+        if max_age_ms > 0:
+            hit = self._query_cache.get(key)
+            if hit is not None and time.monotonic() - hit[0] < max_age_ms / 1000.0:
+                return hit[1]
+        reply = self._cmd(letter, payload, expect_reply=True) or ""
+        self._query_cache[key] = (time.monotonic(), reply)
+        return reply
+
+    def _cmd_axes(self, letter: str, chunk: bytes) -> None:
+        """軸指定ペイロード（バイト列）付きの応答なしコマンドを送る。"""
+        self._invalidate_query_cache()
+        self._exchange(self._HEADERS[letter] + chunk, expect_reply=False)
+
     # ------------------------------------------------------------------#
     # Utilities
     # ------------------------------------------------------------------#
@@ -166,14 +570,14 @@ class QTController:
     # ------------------------------------------------------------------#
     def reset(self) -> None:
         """RESET コマンドを送信してコントローラを再初期化する。"""
-        self._cmd("RESET", "", expect_reply=False)
+        self._send_immediate("RESET")
 
     def resta(self) -> None:
         """RESTA コマンドを送信してソフトリスタートする。"""
-        self._cmd("RESTA", "", expect_reply=False)
+        self._send_immediate("RESTA")
 
     def estop(self) -> None:
-        self._cmd("E", "", expect_reply=False)
+        self._send_immediate("E")
 
     def home(self, *axes: str) -> None:
         if not axes:
@@ -203,25 +607,25 @@ class QTController:
         chunk = _format_axes(axes)
         if not chunk:
             raise ValueError("Provide at least one of A=..., B=...")
-        self._cmd("A", chunk, expect_reply=False)
+        self._cmd_axes("A", chunk)
 
     def abs_go(self, **axes: AxisValue) -> None:
         chunk = _format_axes(axes)
         if not chunk:
             raise ValueError("Provide at least one of A=..., B=...")
-        self._cmd("AGO", chunk, expect_reply=False)
+        self._cmd_axes("AGO", chunk)
 
     def rel_set(self, **axes: AxisValue) -> None:
         chunk = _format_axes(axes)
         if not chunk:
             raise ValueError("Provide at least one of A=..., B=...")
-        self._cmd("M", chunk, expect_reply=False)
+        self._cmd_axes("M", chunk)
 
     def rel_go(self, **axes: AxisValue) -> None:
         chunk = _format_axes(axes)
         if not chunk:
             raise ValueError("Provide at least one of A=..., B=...")
-        self._cmd("MGO", chunk, expect_reply=False)
+        self._cmd_axes("MGO", chunk)
 
     def go(self, *axes: str) -> None:
         payload = " ".join(axes) if axes else ""
@@ -245,37 +649,52 @@ class QTController:
         chunk = _format_axes(axes_dir)
         if not chunk:
             raise ValueError("Provide A=dir/B=dir")
-        self._cmd("J", chunk, expect_reply=False)
+        self._cmd_axes("J", chunk)
 
     def jog_start(self, **axes_dir: int) -> None:
         chunk = _format_axes(axes_dir)
         if not chunk:
             raise ValueError("Provide A=dir/B=dir")
-        self._cmd("JGO", chunk, expect_reply=False)
+        self._cmd_axes("JGO", chunk)
 
     # -- IO ------------------------------------------------------------#
     def set_outputs(self, o1: int, o2: int, o3: int, o4: int) -> None:
         self._cmd("C", f"{o4}{o3}{o2}{o1}", expect_reply=False)
+        # pipeline 中は溜めただけで書き込みの成否が分からないため、状態不明として扱う
+        queued = getattr(self._pipeline, "pending", None) is not None
+        self._last_outputs = None if queued else (o1, o2, o3, o4)
+
+    def set_outputs_diff(self, o1: int, o2: int, o3: int, o4: int) -> bool:
+        """
+        直前に送った出力状態と異なる場合だけ ``set_outputs`` を送る。送信したら True を返す。
+
+        リセット・非常停止や ``send_batch`` / ``submit`` での生コマンド送信後は状態不明として
+        必ず送信する。
+        """
+        if (o1, o2, o3, o4) == self._last_outputs:
+            return False
+        self.set_outputs(o1, o2, o3, o4)
+        return True
 
-    def read_outputs(self) -> str:
-        return self._cmd("C", "R", expect_reply=True) or ""
+    def read_outputs(self, max_age_ms: float = 0) -> str:
+        return self._query("C", "R", max_age_ms)
 
-    def read_inputs(self) -> str:
-        return self._cmd("Y", "", expect_reply=True) or ""
+    def read_inputs(self, max_age_ms: float = 0) -> str:
+        return self._query("Y", "", max_age_ms)
 
-    def read_sensors(self, axis: Optional[str] = None) -> str:
+    def read_sensors(self, axis: Optional[str] = None, max_age_ms: float = 0) -> str:
         payload = axis if axis else ""
-        return self._cmd("I", payload, expect_reply=True) or ""
+        return self._query("I", payload, max_age_ms)
 
     # -- Parameters / Queries -----------------------------------------#
-    def param_read(self, no: int) -> str:
-        return self._cmd("P", f"{no}R", expect_reply=True) or ""
+    def param_read(self, no: int, max_age_ms: float = 0) -> str:
+        return self._query("P", f"{no}R", max_age_ms)
 
     def param_write(self, no: int, *values: Union[int, float, str]) -> None:
         payload = f"{no}" + "".join(str(v) for v in values)
         self._cmd("P", payload, expect_reply=False)
 
-    def query(self, code: int, axis: Optional[str] = None) -> str:
+    def query(self, code: int, axis: Optional[str] = None, max_age_ms: float = 0) -> str:
         if axis:
-            return self._cmd("Q", f"{axis}{code}", expect_reply=True) or ""
-        return self._cmd("Q", f"{code}", expect_reply=True) or ""
+            return self._query("Q", f"{axis}{code}", max_age_ms)
+        return self._query("Q", f"{code}", max_age_ms)
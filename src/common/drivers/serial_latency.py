@@ -0,0 +1,50 @@
+"""USB シリアル変換器の低レイテンシ設定ヘルパー。
+
+FTDI などの USB シリアル変換器は既定で受信データを最大 16 ms 程度ため込んでから
+ホストへ渡すため、1 往復ごとの応答待ちがこの待ち時間に支配される。ここでは
+ポートを開いた直後に低レイテンシモードを要求し、使えない環境では何もしない。
+"""
+from __future__ import annotations
+
+import logging
+import os
+import sys
+
+LOG = logging.getLogger(__name__)
+
+
+def enable_low_latency(ser, port: str) -> bool:
+    """
+    開いたシリアルポートに低レイテンシモードを設定する。成功したら True を返す。
+
+    pyserial の ``set_low_latency_mode``（Linux の ASYNC_LOW_LATENCY）を優先し、
+    失敗した場合は Linux の usb-serial の ``latency_timer`` を 1 ms に書き換える。
+    権限不足や未対応の OS では例外を出さずに False を返す。USB シリアル変換器なのに
+    設定できなかった場合（権限不足など）は警告を出す。
+    """
+    set_mode = getattr(ser, "set_low_latency_mode", None)
+    if set_mode is not None:
+        try:
+            set_mode(True)
+            return True
+        except (OSError, ValueError, NotImplementedError) as exc:
+            LOG.debug("low latency ioctl failed on %s: %s", port, exc)
+
+    if not sys.platform.startswith("linux"):
+        return False
+    tty = os.path.basename(os.path.realpath(port))
+    timer_path = f"/sys/bus/usb-serial/devices/{tty}/latency_timer"
+    try:
+        with open(timer_path, "w", encoding="ascii") as fh:
+            fh.write("1")
+        return True
+    except FileNotFoundError:
+        # USB シリアル変換器ではない（内蔵 UART や pty）ので待ち時間の問題もない
+        LOG.debug("%s is not a usb-serial device; latency_timer not available", port)
+        return False
+    except OSError as exc:
+        LOG.warning("低レイテンシ設定に失敗しました (%s): %s — 応答待ちが遅くなる場合があります", timer_path, exc)
+        return False
+
+
+__all__ = ["enable_low_latency"]
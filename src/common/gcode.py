@@ -12,7 +12,7 @@ import logging
 import re
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import Dict, Iterable, Tuple
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
 
 __all__ = [
     "BaseModalState",
@@ -22,6 +22,32 @@ __all__ = [
     "LinearGCodeInterpreter",
 ]
 
+# 1 行ごとに呼ばれるためパターンはモジュール読み込み時に一度だけコンパイルする。
+_COMMENT_RE = re.compile(r"\([^)]*\)")
+_WORD_RE = re.compile(r"([A-Za-z])([+\-0-9.]*)")
+
+
+def _tokenize(line: str) -> List[Tuple[str, float]]:
+    """
+    1 行を ``(大文字のアドレス文字, 数値)`` の列へ分解する。
+
+    括弧コメントと ``;`` 以降は読み飛ばし、数値へ変換できないワードは捨てる。
+    文字単位の走査は CPython では正規表現エンジンより遅いため、ワードの
+    切り出しだけは ``findall`` に任せている。SVG やパターンから生成した行はほぼすべて
+    座標が異なり再利用できないため、行単位のキャッシュは持たない（ヒットせず遅くなるだけ）。
+    """
+    if "(" in line:
+        line = _COMMENT_RE.sub("", line)
+    if ";" in line:
+        line = line.split(";", 1)[0]
+    tokens: List[Tuple[str, float]] = []
+    for code, value in _WORD_RE.findall(line):
+        try:
+            tokens.append((code.upper(), float(value)))
+        except ValueError:
+            continue
+    return tokens
+
 
 @dataclass
 class BaseModalState:
@@ -59,79 +85,85 @@ class BaseGCodeInterpreter(ABC):
     """
 
     modal_state_cls = BaseModalState
-    motion_g_codes: Tuple[int, ...] = (0, 1)
+    motion_g_codes: FrozenSet[int] = frozenset({0, 1})
 
     def __init__(self, driver):
         self.drv = driver
         self.m = self._create_modal_state()
+        # モーダル G コード → 状態更新メソッド。行ごとの if 連鎖を辞書引き 1 回にする。
+        self._modal_handlers = {
+            20: self._set_units_inch,
+            21: self._set_units_mm,
+            90: self._set_absolute,
+            91: self._set_incremental,
+        }
 
     def _create_modal_state(self) -> BaseModalState:
         return self.modal_state_cls()
 
     def exec(self, line: str) -> None:
         logging.debug("[GCode] exec: %s", line)
-        line = self._strip_comment(line).strip()
-        if not line:
+        # 空行・行頭 ";" コメントはトークナイザ（正規表現）を通さずに捨てる
+        head = line.lstrip()
+        if not head or head[0] == ";":
             return
-        if line.startswith("$H"):
+        if "$H" in line and self._strip_comment(line).strip().startswith("$H"):
             if hasattr(self.drv, "home"):
                 self.drv.home()
             return
 
-        words = re.findall(r"[A-Za-z][+\-0-9\.]*", line)
-        if not words:
+        g_codes: List[float] = []
+        params: Dict[str, float] = {}
+        for code, value in _tokenize(line):
+            if code == "G":
+                g_codes.append(value)
+            else:
+                params[code] = value
+        if not g_codes and not params:
             return
 
-        self._apply_modal(words)
-        self._update_feed(words)
-
-        if self._contains_motion(words):
-            self._handle_motion(words)
-
-    def _apply_modal(self, words: Iterable[str]) -> None:
-        for w in words:
-            code, value = w[0].upper(), w[1:]
-            if code != "G":
-                continue
-            try:
-                g = float(value)
-            except ValueError:
-                continue
-            if g == 20:
-                self.m.units_mm = False
-                if hasattr(self.drv, "set_units_inch"):
-                    self.drv.set_units_inch()
-            elif g == 21:
-                self.m.units_mm = True
-                if hasattr(self.drv, "set_units_mm"):
-                    self.drv.set_units_mm()
-            elif g == 90:
-                self.m.absolute = True
-            elif g == 91:
-                self.m.absolute = False
-
-    def _update_feed(self, words: Iterable[str]) -> None:
-        for w in words:
-            if w[0].upper() == "F":
-                try:
-                    self.m.feed = float(w[1:])
-                except ValueError:
-                    continue
-
-    def _contains_motion(self, words: Iterable[str]) -> bool:
-        for w in words:
-            if w[0].upper() != "G":
-                continue
-            try:
-                g = int(float(w[1:]))
-            except ValueError:
-                continue
-            if g in self.motion_g_codes:
-                return True
-        return False
+        self._apply_modal(g_codes)
+        if "F" in params:
+            self.m.feed = params["F"]
+
+        gcode = self._find_motion(g_codes)
+        if gcode is not None:
+            self._handle_motion(gcode, params)
+
+    def _apply_modal(self, g_codes: Iterable[float]) -> None:
+        handlers = self._modal_handlers
+        for g in g_codes:
+            handler = handlers.get(g)
+            if handler is not None:
+                handler()
+
+    def _set_units_inch(self) -> None:
+        self.m.units_mm = False
+        if hasattr(self.drv, "set_units_inch"):
+            self.drv.set_units_inch()
+
+    def _set_units_mm(self) -> None:
+        self.m.units_mm = True
+        if hasattr(self.drv, "set_units_mm"):
+            self.drv.set_units_mm()
+
+    def _set_absolute(self) -> None:
+        self.m.absolute = True
+
+    def _set_incremental(self) -> None:
+        self.m.absolute = False
+
+    def _find_motion(self, g_codes: List[float]) -> Optional[int]:
+        """行内で最後に現れたモーション G コードを返す。無ければ None。"""
+        motion = self.motion_g_codes
+        for g in reversed(g_codes):
+            g_int = int(g)
+            if g_int in motion:
+                return g_int
+        return None
 
     @abstractmethod
-    def _handle_motion(self, words: Iterable[str]) -> None:
+    def _handle_motion(self, gcode: int, params: Dict[str, float]) -> None:
         """派生クラスでモーションコマンドを処理する。"""
 
     def _unit_to_mm(self, value: float) -> float:
@@ -139,7 +171,7 @@ class BaseGCodeInterpreter(ABC):
 
     @staticmethod
     def _strip_comment(source: str) -> str:
-        source = re.sub(r"\(.*?\)", "", source)
+        source = _COMMENT_RE.sub("", source)
         return source.split(";", 1)[0]
 
 
@@ -154,56 +186,104 @@ class LinearGCodeInterpreter(BaseGCodeInterpreter):
 
     linear_axes: Tuple[str, ...] = ()
     extra_params: Tuple[str, ...] = ()
-    motion_g_codes: Tuple[int, ...] = (0, 1)
-
-    def _handle_motion(self, words: Iterable[str]) -> None:
-        gcode = None
-        params: Dict[str, float] = {}
-
-        for w in words:
-            code, value = w[0].upper(), w[1:]
-            if code == "G":
-                try:
-                    gcode = int(float(value))
-                except ValueError:
-                    continue
-            elif code in self.linear_axes or code in self.extra_params or code == "F":
-                try:
-                    params[code] = float(value)
-                except ValueError:
-                    continue
+    motion_g_codes: FrozenSet[int] = frozenset({0, 1})
 
+    def _handle_motion(self, gcode: int, params: Dict[str, float]) -> None:
         if gcode in (0, 1):
             self._handle_linear_move(gcode, params)
             return
 
-        self._handle_extended_motion(gcode, params, words)
+        self._handle_extended_motion(gcode, params)
+
+    def move(self, *, feed: Optional[float] = None, rapid: bool = False, **axes: float) -> None:
+        """
+        G-code テキストを介さずに直線移動する。
+
+        座標は絶対値 [mm]、``feed`` は [mm/min] で与える。省略した軸は現在値を
+        維持し、``feed`` 省略時はモーダルの送り速度を使う。パターン生成のように
+        座標がプロセス内で決まっている場合、文字列の整形と再解析を省ける。
+        """
+        targets: Dict[str, float] = {}
+        for axis in self.linear_axes:
+            key = axis.lower()
+            value = axes.get(key)
+            targets[key] = getattr(self.m, f"{key}pos", 0.0) if value is None else float(value)
+        if feed is None:
+            feed = getattr(self.m, "feed", None)
+        self._do_linear(targets, feed, rapid)
+
+    def exec_moves_abs(self, *columns: Iterable[float], feed: Optional[float] = None, rapid: bool = False) -> None:
+        """
+        絶対座標 [mm] の点列へ順に直線移動する。G0/G1 行を点の数だけ exec するのと同じ。
+
+        ``columns`` には ``linear_axes`` の順で各軸の座標列（リストや NumPy 配列）を渡す。
+        ``feed`` 省略時はモーダルの送り速度を使う。XY でドライバが ``move_abs_batch`` を
+        持つ場合は点列をまとめて渡す。
+        """
+        if len(columns) != len(self.linear_axes):
+            raise ValueError(f"{len(self.linear_axes)} 軸分の座標列が必要です")
+        cols = [c.tolist() if hasattr(c, "tolist") else list(c) for c in columns]
+        if not cols or not cols[0]:
+            return
+        if feed is None:
+            feed = getattr(self.m, "feed", None)
+        keys = [axis.lower() for axis in self.linear_axes]
+
+        if keys == ["x", "y"]:
+            batch = getattr(self.drv, "move_abs_batch", None)
+            if batch is not None:
+                batch(list(zip(cols[0], cols[1])), feed=feed, rapid=rapid)
+            else:
+                move_abs = self.drv.move_abs
+                for x, y in zip(cols[0], cols[1]):
+                    move_abs(x=x, y=y, feed=feed, rapid=rapid)
+        else:
+            move_abs = self.drv.move_abs
+            for values in zip(*cols):
+                move_abs(feed=feed, rapid=rapid, **dict(zip(keys, values)))
+
+        for key, col in zip(keys, cols):
+            setattr(self.m, f"{key}pos", float(col[-1]))
 
     def _handle_linear_move(self, gcode: int, params: Dict[str, float]) -> None:
+        m = self.m
+        if m.units_mm and m.absolute:
+            self._handle_linear_move_abs_mm(gcode, params)
+            return
+
+        to_mm = self._unit_to_mm
+        absolute = m.absolute
         targets: Dict[str, float] = {}
         for axis in self.linear_axes:
-            attr = f"{axis.lower()}pos"
-            current = getattr(self.m, attr, 0.0)
+            key = axis.lower()
+            current = getattr(m, f"{key}pos", 0.0)
             if axis in params:
-                raw = params[axis]
-                delta = self._unit_to_mm(raw)
-                target = delta if self.m.absolute else current + delta
+                delta = to_mm(params[axis])
+                target = delta if absolute else current + delta
             else:
                 target = current
-            targets[axis] = target
+            targets[key] = target
 
-        feed = params["F"] if "F" in params else None
-        feed_value = self._unit_to_mm(feed) if feed is not None else getattr(self.m, "feed", None)
+        feed = params.get("F")
+        feed_value = to_mm(feed) if feed is not None else getattr(m, "feed", None)
+        self._do_linear(targets, feed_value, gcode == 0)
 
-        driver_kwargs = {axis.lower(): targets[axis] for axis in self.linear_axes}
-        self.drv.move_abs(feed=feed_value, rapid=(gcode == 0), **driver_kwargs)
+    def _handle_linear_move_abs_mm(self, gcode: int, params: Dict[str, float]) -> None:
+        """既定モーダル（mm・絶対座標）専用の経路。単位換算と増分計算の分岐を省く。"""
+        m = self.m
+        targets: Dict[str, float] = {}
+        for axis in self.linear_axes:
+            key = axis.lower()
+            targets[key] = params[axis] if axis in params else getattr(m, f"{key}pos", 0.0)
+        self._do_linear(targets, params.get("F", getattr(m, "feed", None)), gcode == 0)
 
-        for axis, value in targets.items():
-            setattr(self.m, f"{axis.lower()}pos", value)
+    def _do_linear(self, targets: Dict[str, float], feed: Optional[float], rapid: bool) -> None:
+        """絶対座標 [mm] の目標をドライバへ送り、モーダル座標を更新する。"""
+        self.drv.move_abs(feed=feed, rapid=rapid, **targets)
+        for key, value in targets.items():
+            setattr(self.m, f"{key}pos", value)
 
-    def _handle_extended_motion(
-        self, gcode: int | None, params: Dict[str, float], words: Iterable[str]
-    ) -> None:
+    def _handle_extended_motion(self, gcode: int | None, params: Dict[str, float]) -> None:
         if gcode is None:
             return
         raise NotImplementedError(f"G{gcode} は未対応です")
@@ -9,6 +9,23 @@ import platform
 from pathlib import Path
 from typing import Callable, Optional, Sequence, Tuple
 
+# 実行中にプラットフォームは変わらないため、判定は import 時に 1 回だけ行う。
+SYSTEM = platform.system().lower()
+IS_WINDOWS = SYSTEM == "windows"
+IS_MACOS = SYSTEM == "darwin"
+IS_LINUX = SYSTEM == "linux"
+_PLATFORM_NAMES = {"windows": "Windows", "darwin": "macOS", "linux": "Linux"}
+PLATFORM_NAME = _PLATFORM_NAMES.get(SYSTEM, SYSTEM.title())
+_PLATFORM_INFO = {
+    "system": SYSTEM,
+    "name": PLATFORM_NAME,
+    "is_windows": IS_WINDOWS,
+    "is_macos": IS_MACOS,
+    "is_linux": IS_LINUX,
+    "version": platform.version(),
+    "machine": platform.machine(),
+}
+
 
 class EnvironmentAdapter:
     """
@@ -22,21 +39,13 @@ class EnvironmentAdapter:
         self._input = input_func or input
 
     def get_platform_info(self) -> dict:
-        system = platform.system().lower()
-        return {
-            "system": system,
-            "is_windows": system == "windows",
-            "is_macos": system == "darwin",
-            "is_linux": system == "linux",
-            "version": platform.version(),
-            "machine": platform.machine(),
-        }
+        # 呼び出し側での書き換えが共有値へ波及しないようコピーを返す
+        return dict(_PLATFORM_INFO)
 
     def get_default_serial_ports(self) -> Sequence[str]:
-        info = self.get_platform_info()
-        if info["is_windows"]:
+        if IS_WINDOWS:
             return ["COM1", "COM2", "COM3", "COM4", "COM5"]
-        if info["is_macos"]:
+        if IS_MACOS:
             return [
                 "/dev/tty.usbserial-*",
                 "/dev/tty.usbmodem*",
@@ -48,12 +57,12 @@ class EnvironmentAdapter:
         return str(Path(path_str).expanduser().resolve())
 
     def get_venv_activate_command(self) -> str:
-        if self.get_platform_info()["is_windows"]:
+        if IS_WINDOWS:
             return ".venv\\Scripts\\activate.bat"
         return "source .venv/bin/activate"
 
     def get_python_executable(self) -> str:
-        if self.get_platform_info()["is_windows"]:
+        if IS_WINDOWS:
             return "python.exe"
         return "python3"
 
@@ -78,8 +87,7 @@ class EnvironmentAdapter:
         root = tk.Tk()
         root.withdraw()
 
-        info = self.get_platform_info()
-        if info["is_windows"]:
+        if IS_WINDOWS:
             root.wm_attributes("-topmost", 1)
 
         initial_dir = self.normalize_path(initialdir) if initialdir else self.normalize_path(".")
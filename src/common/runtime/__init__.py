@@ -1,5 +1,5 @@
 from .config import ConfigLoader
 from .jobs import JobDispatcher
-from .visuals import VisualizationController
+from .visuals import VisualizationController, save_animation
 
-__all__ = ["ConfigLoader", "JobDispatcher", "VisualizationController"]
+__all__ = ["ConfigLoader", "JobDispatcher", "VisualizationController", "save_animation"]
@@ -9,6 +9,11 @@ from typing import Callable, Optional
 
 import yaml
 
+try:  # libyaml 付きの PyYAML なら C 実装のローダを使う
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # pragma: no cover - libyaml なしのビルド
+    from yaml import SafeLoader as _YamlLoader  # type: ignore[assignment]
+
 
 class ConfigLoader:
     """YAML 設定の読み込みと既定値適用を担う。"""
@@ -23,7 +28,7 @@ class ConfigLoader:
             if not cfg_path.exists():
                 raise FileNotFoundError(f"設定ファイルが見つかりません: {path}")
             with cfg_path.open("r", encoding="utf-8") as fh:
-                config = yaml.safe_load(fh) or {}
+                config = yaml.load(fh, Loader=_YamlLoader) or {}
         elif self._default_factory is not None:
             config = self._default_factory(driver_override)
 
@@ -5,7 +5,7 @@
 from __future__ import annotations
 
 import os
-from typing import Optional
+from typing import Callable, Iterable, Optional
 
 
 class VisualizationController:
@@ -33,7 +33,9 @@ class VisualizationController:
         selected_file: Optional[str] = None,
     ) -> bool:
         visual = cfg_visual or {}
-        show_flag = force_show or bool(visual.get("show", False))
+        save_path = visual.get("save")
+        # save 指定時は show が無くても描画してファイルへ書き出す（ウィンドウは出ない）
+        show_flag = force_show or bool(visual.get("show", False)) or bool(save_path)
         if not show_flag:
             if self._skip_message:
                 print(self._skip_message)
@@ -45,9 +47,50 @@ class VisualizationController:
         if selected_file:
             title = f"{title} - {os.path.basename(selected_file)}"
 
-        self._driver.animate_tracks(animate=animate, fps=fps, title=title)
+        kwargs = {}
+        if "max_frames" in visual:
+            # 0 や null で間引きなし
+            kwargs["max_frames"] = int(visual["max_frames"] or 0) or None
+        if save_path:
+            kwargs["save_path"] = str(save_path)
+        self._driver.animate_tracks(animate=animate, fps=fps, title=title, **kwargs)
 
         if self._done_message:
             print(self._done_message)
 
         return True
+
+
+def save_animation(
+    fig,
+    update: Callable,
+    frames: Iterable,
+    save_path: str,
+    *,
+    fps: int = 30,
+    init_func: Optional[Callable] = None,
+) -> None:
+    """
+    FuncAnimation を使わずにフレームを順に描画し、GIF / MP4 として書き出す。
+
+    update は FuncAnimation と同じくフレーム値を受け取ってアーティストを更新する関数。
+    アーティストはフレーム間で使い回し、描画後のキャンバスのバッファをそのまま imageio に渡す。
+    """
+    suffix = os.path.splitext(save_path)[1].lower()
+    if suffix not in (".gif", ".mp4"):
+        raise SystemExit(f"アニメーションの保存形式は .gif / .mp4 のみ対応しています: {save_path}")
+    try:
+        import imageio.v2 as imageio
+    except Exception as e:
+        raise SystemExit("アニメーションの保存には imageio が必要です: pip install imageio") from e
+    import numpy as np
+
+    if init_func is not None:
+        init_func()
+    # GIF は 1 フレームの表示時間 [ms]、動画はフレームレートで指定する
+    options = {"duration": 1000 / fps, "loop": 0} if suffix == ".gif" else {"fps": fps}
+    with imageio.get_writer(save_path, **options) as writer:
+        for frame in frames:
+            update(frame)
+            fig.canvas.draw()
+            writer.append_data(np.asarray(fig.canvas.buffer_rgba())[..., :3])
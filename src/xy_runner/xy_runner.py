@@ -5,14 +5,16 @@ Config-driven XY runner
 - Drivers: sim / chuo
 - Jobs: grid_circles, svg  (NEW: SVG -> path -> moves)
 Dependencies:
-  pip install pyyaml matplotlib pyserial svgpathtools
+  pip install pyyaml matplotlib numpy pyserial svgpathtools
 """
 import argparse
+import array
 import logging
 import math
 import os
 import sys
 import time
+from functools import lru_cache, partial
 from pathlib import Path
 from typing import Mapping, Optional, Any
 
@@ -23,13 +25,13 @@ if src_str in sys.path:
     sys.path.remove(src_str)
 sys.path.insert(0, src_str)
 
-import matplotlib.pyplot as plt
+import numpy as np
 
 from common.drivers import CncDriver, create_actual_driver
 from common.gcode import LinearGCodeInterpreter, ModalState2D
 from common.jobs import Job, JobFactory
 from common.platform import EnvironmentAdapter
-from common.runtime import ConfigLoader, JobDispatcher, VisualizationController
+from common.runtime import ConfigLoader, JobDispatcher, VisualizationController, save_animation
 
 
 def _resolve_resource_path(file_entry: str, context: Mapping[str, Any]) -> Path:
@@ -38,18 +40,68 @@ def _resolve_resource_path(file_entry: str, context: Mapping[str, Any]) -> Path:
         return path
 
     # context entries may be Path or str; coerce to str before constructing Path
-    config_dir = Path(str(context.get("config_dir", Path.cwd())))
-    project_root = Path(str(context.get("project_root", config_dir)))
-    candidates = []
-    for base in (config_dir, config_dir.parent, project_root):
-        if base and base not in candidates:
-            candidates.append(base)
+    config_dir = str(context.get("config_dir", Path.cwd()))
+    project_root = str(context.get("project_root", config_dir))
+    return Path(_resolve_relative(file_entry, config_dir, project_root))
 
-    for base in candidates:
-        candidate = (base / file_entry).resolve()
-        if candidate.exists():
-            return candidate
-    return (config_dir / file_entry).resolve()
+
+@lru_cache(maxsize=256)
+def _resolve_relative(file_entry: str, config_dir: str, project_root: str) -> str:
+    """
+    相対パスを設定ディレクトリ → その親 → プロジェクトルートの順に探す。
+
+    同じ組み合わせの解決結果は覚えておき、stat の繰り返しを避ける。設定を読み直したら
+    ``_resolve_relative.cache_clear()`` で破棄する。
+    """
+    base_dir = Path(config_dir)
+    bases = dict.fromkeys((base_dir, base_dir.parent, Path(project_root)))
+    found = next((c for c in ((base / file_entry).resolve() for base in bases) if c.exists()), None)
+    return str(found or (base_dir / file_entry).resolve())
+
+
+def _arc_points(cx, cy, rx, ry, sweep, steps):
+    """
+    中心 (cx, cy) から始点へのベクトル (rx, ry) を sweep だけ回す円弧を steps 分割し、
+    各点 (始点を除く) の X/Y 配列を返す。
+
+    三角関数は 1 ステップ分の回転量に対して 1 回だけ評価し、以降は複素数の
+    累積積で半径ベクトルを回転させる。
+    """
+    dth = sweep / steps
+    rotations = np.cumprod(np.full(steps, complex(math.cos(dth), math.sin(dth))))
+    points = complex(rx, ry) * rotations
+    return cx + points.real, cy + points.imag
+
+
+def compute_arc_points(x0, y0, ex, ey, cx, cy, cw, tol):
+    """
+    始点 (x0, y0) から終点 (ex, ey) まで中心 (cx, cy) の円弧を、弦の誤差が tol [mm] 以内の
+    折れ線に分割し、各点（始点を除く）の X/Y 配列を返す。始点と終点が一致すれば一周とする。
+    """
+    rx, ry = x0 - cx, y0 - cy
+    # 始点・終点ベクトルの外積と内積から、なす角を atan2 1 回で求める
+    erx, ery = ex - cx, ey - cy
+    sweep = math.atan2(rx * ery - ry * erx, rx * erx + ry * ery)
+    # 回転方向の符号を掛けて [0, 2π) へ畳み、0（始点=終点）は一周として扱う
+    sign = -1.0 if cw else 1.0
+    sweep = sign * ((sign * sweep) % math.tau or math.tau)
+    radius = math.sqrt(rx * rx + ry * ry)
+    max_d = 2 * math.acos(max(0.0, 1 - tol / max(radius, 1e-9)))
+    steps = max(12, int(math.ceil(abs(sweep) / max(1e-3, max_d))))
+    return _arc_points(cx, cy, rx, ry, sweep, steps)
+
+
+@lru_cache(maxsize=64)
+def _circle_offsets(r, cw, tol):
+    """
+    半径 r の全周を (+r, 0) から折れ線にしたときの、中心からの相対座標 (X 配列, Y 配列)。
+
+    分割は中心位置によらないため、同じ半径の円を並べるパターンでは一度だけ計算して使い回す。
+    """
+    xs, ys = compute_arc_points(r, 0.0, r, 0.0, 0.0, 0.0, cw, tol)
+    xs.flags.writeable = False
+    ys.flags.writeable = False
+    return xs, ys
 
 
 # ========= 共通（簡易Gコードラッパ：直線/円弧） =========
@@ -57,60 +109,91 @@ class GCodeWrapper(LinearGCodeInterpreter):
     modal_state_cls = ModalState2D
     linear_axes = ("X", "Y")
     extra_params = ("I", "J")
-    motion_g_codes = (0, 1, 2, 3)
+    motion_g_codes = frozenset({0, 1, 2, 3})
+    # 円弧を折れ線で近似するときの弦高さの許容値 [mm]
+    arc_tolerance_mm = 0.02
+
+    def __init__(self, driver, *, arc_tolerance_mm=None):
+        super().__init__(driver)
+        if arc_tolerance_mm is not None:
+            self.arc_tolerance_mm = float(arc_tolerance_mm)
+
+    def arc(self, x, y, i, j, *, cw=False, feed=None):
+        """
+        G-code テキストを介さずに円弧補間する（G2/G3 相当）。
+
+        終点 (x, y) は絶対座標 [mm]、(i, j) は現在位置から中心へのオフセット [mm]。
+        feed 省略時はモーダルの送り速度を使う。
+        """
+        cx = self.m.xpos + float(i)
+        cy = self.m.ypos + float(j)
+        if feed is None:
+            feed = getattr(self.m, "feed", None)
+        self._do_arc(float(x), float(y), cx, cy, feed, cw)
 
-    def _handle_extended_motion(self, gcode, params, words):
+    def circle(self, cx, cy, r, *, cw=False, feed=None):
+        """
+        現在位置 (cx + r, cy) から中心 (cx, cy)、半径 r の円を一周する（G2/G3 の全周と同じ）。
+
+        折れ線の形は中心によらないため、同じ半径・向きの分割結果を平行移動して使い回す。
+        """
+        if feed is None:
+            feed = getattr(self.m, "feed", None)
+        xs, ys = _circle_offsets(float(r), bool(cw), self.arc_tolerance_mm)
+        self.exec_moves_abs(cx + xs, cy + ys, feed=feed)
+
+    def _handle_extended_motion(self, gcode, params):
         if gcode not in (2, 3):
-            super()._handle_extended_motion(gcode, params, words)
+            super()._handle_extended_motion(gcode, params)
             return
 
+        m = self.m
         cw = gcode == 2
-        x_delta = self._unit_to_mm(params["X"]) if "X" in params else None
-        y_delta = self._unit_to_mm(params["Y"]) if "Y" in params else None
+        if m.units_mm and m.absolute:
+            # 既定モーダル（mm・絶対座標）では単位換算と増分計算を省く
+            mx, my = m.xpos, m.ypos
+            feed = params["F"] if "F" in params else getattr(m, "feed", None)
+            self._do_arc(
+                params.get("X", mx),
+                params.get("Y", my),
+                mx + params.get("I", 0.0),
+                my + params.get("J", 0.0),
+                feed,
+                cw,
+            )
+            return
 
-        if self.m.absolute:
-            ex = x_delta if x_delta is not None else self.m.xpos
-            ey = y_delta if y_delta is not None else self.m.ypos
-        else:
-            ex = self.m.xpos + (x_delta if x_delta is not None else 0.0)
-            ey = self.m.ypos + (y_delta if y_delta is not None else 0.0)
-
-        i_off = self._unit_to_mm(params.get("I", 0.0))
-        j_off = self._unit_to_mm(params.get("J", 0.0))
-        cx = self.m.xpos + i_off
-        cy = self.m.ypos + j_off
-
-        feed = self._unit_to_mm(params["F"]) if "F" in params else getattr(self.m, "feed", None)
-
-        start = math.atan2(self.m.ypos - cy, self.m.xpos - cx)
-        end = math.atan2(ey - cy, ex - cx)
-        sweep = end - start
-        if cw:
-            if sweep >= 0:
-                sweep -= 2 * math.pi
-        else:
-            if sweep <= 0:
-                sweep += 2 * math.pi
-        radius = math.hypot(self.m.xpos - cx, self.m.ypos - cy)
-        e = 0.02
-        max_d = 2 * math.acos(max(0.0, 1 - e / max(radius, 1e-9)))
-        steps = max(12, int(math.ceil(abs(sweep) / max(1e-3, max_d))))
-        logging.debug(
-            "[DEBUG] Arc move: ex=%s, ey=%s, cx=%s, cy=%s, R=%s, steps=%s",
-            ex,
-            ey,
-            cx,
-            cy,
-            radius,
-            steps,
-        )
+        to_mm = self._unit_to_mm
+        x_delta = to_mm(params["X"]) if "X" in params else None
+        y_delta = to_mm(params["Y"]) if "Y" in params else None
 
-        for k in range(1, steps + 1):
-            th = start + sweep * (k / steps)
-            px = cx + radius * math.cos(th)
-            py = cy + radius * math.sin(th)
-            logging.debug("[DEBUG] Arc step: px=%s, py=%s, feed=%s", px, py, feed)
-            self.drv.move_abs(x=px, y=py, feed=feed, rapid=False)
+        if m.absolute:
+            ex = x_delta if x_delta is not None else m.xpos
+            ey = y_delta if y_delta is not None else m.ypos
+        else:
+            ex = m.xpos + (x_delta if x_delta is not None else 0.0)
+            ey = m.ypos + (y_delta if y_delta is not None else 0.0)
+
+        cx = m.xpos + to_mm(params.get("I", 0.0))
+        cy = m.ypos + to_mm(params.get("J", 0.0))
+
+        feed = to_mm(params["F"]) if "F" in params else getattr(m, "feed", None)
+        self._do_arc(ex, ey, cx, cy, feed, cw)
+
+    def _do_arc(self, ex, ey, cx, cy, feed, cw):
+        """現在位置から終点 (ex, ey) まで中心 (cx, cy) の円弧を折れ線で送る。"""
+        x0, y0 = self.m.xpos, self.m.ypos
+        pxs, pys = compute_arc_points(x0, y0, ex, ey, cx, cy, cw, self.arc_tolerance_mm)
+        # DEBUG 無効時は引数タプルすら作らないよう、レベル判定を 1 回だけ先に済ませる
+        if logging.getLogger().isEnabledFor(logging.DEBUG):
+            radius = math.hypot(x0 - cx, y0 - cy)
+            logging.debug(
+                "[DEBUG] Arc move: ex=%s, ey=%s, cx=%s, cy=%s, R=%s, steps=%s", ex, ey, cx, cy, radius, len(pxs)
+            )
+            for px, py in zip(pxs.tolist(), pys.tolist()):
+                logging.debug("[DEBUG] Arc step: px=%s, py=%s, feed=%s", px, py, feed)
+        # 折れ線の点列はまとめて渡す（ドライバが move_abs_batch を持てば 1 回の呼び出しになる）
+        self.exec_moves_abs(pxs, pys, feed=feed)
 
         self.m.xpos, self.m.ypos = ex, ey
 
@@ -123,9 +206,33 @@ class SimDriver(CncDriver):
         """
         シミュレーション用ドライバ。座標履歴（tracks）を記録し、matplotlibで可視化可能。
         """
-        self.tracks = []  # 移動履歴（(x0,y0,x1,y1,rapid,feed)）
+        # 移動履歴は列ごとの連続配列（SoA）で保持する。feed 未指定は NaN で表す。
+        self._x0 = array.array("d")
+        self._y0 = array.array("d")
+        self._x1 = array.array("d")
+        self._y1 = array.array("d")
+        self._rapid = array.array("b")
+        self._feed = array.array("d")
         self._cx = 0.0  # 現在のX座標
         self._cy = 0.0  # 現在のY座標
+        # move_abs 毎のレベル判定を避けるため、ログ設定後に生成される前提で一度だけ判定しておく
+        self._debug = logging.getLogger().isEnabledFor(logging.DEBUG)
+
+    @property
+    def tracks(self):
+        """移動履歴（(x0,y0,x1,y1,rapid,feed)）のリスト。互換用に都度組み立てる。"""
+        feeds = [None if f != f else f for f in self._feed]
+        return list(zip(self._x0, self._y0, self._x1, self._y1, map(bool, self._rapid), feeds))
+
+    def _track_arrays(self):
+        """移動履歴を NumPy 配列 (x0, y0, x1, y1, rapid) として返す。"""
+        return (
+            np.array(self._x0, dtype=np.float64),
+            np.array(self._y0, dtype=np.float64),
+            np.array(self._x1, dtype=np.float64),
+            np.array(self._y1, dtype=np.float64),
+            np.array(self._rapid, dtype=bool),
+        )
 
     def set_units_mm(self):
         """
@@ -151,36 +258,77 @@ class SimDriver(CncDriver):
         y_val = axes.get("y")
         nx = self._cx if x_val is None else float(x_val)
         ny = self._cy if y_val is None else float(y_val)
-        logging.debug(
-            "[DEBUG] SimDriver.move_abs: from=(%s,%s) to=(%s,%s), rapid=%s, feed=%s",
-            self._cx,
-            self._cy,
-            nx,
-            ny,
-            rapid,
-            feed,
-        )
-        self.tracks.append((self._cx, self._cy, nx, ny, rapid, feed))
+        if self._debug:
+            logging.debug(
+                "[DEBUG] SimDriver.move_abs: from=(%s,%s) to=(%s,%s), rapid=%s, feed=%s",
+                self._cx,
+                self._cy,
+                nx,
+                ny,
+                rapid,
+                feed,
+            )
+        self._x0.append(self._cx)
+        self._y0.append(self._cy)
+        self._x1.append(nx)
+        self._y1.append(ny)
+        self._rapid.append(1 if rapid else 0)
+        self._feed.append(math.nan if feed is None else float(feed))
         self._cx, self._cy = nx, ny
 
-    def animate_tracks(self, animate=False, fps=2048, title="XY Simulation"):
+    def move_abs_batch(self, points, *, feed=None, rapid=False):
+        """
+        XY 絶対座標 [mm] の列 (N, 2) を順に移動する（履歴に追加）。
+
+        各点を ``move_abs`` で 1 本ずつ積む代わりに、始点/終点の列をまとめて配列へ追加する。
+        """
+        pts = np.asarray(points, dtype=float).reshape(-1, 2)
+        n = len(pts)
+        if not n:
+            return
+        xs, ys = pts[:, 0].tolist(), pts[:, 1].tolist()
+        if self._debug:
+            for x0, y0, x1, y1 in zip([self._cx] + xs[:-1], [self._cy] + ys[:-1], xs, ys):
+                logging.debug(
+                    "[DEBUG] SimDriver.move_abs: from=(%s,%s) to=(%s,%s), rapid=%s, feed=%s",
+                    x0,
+                    y0,
+                    x1,
+                    y1,
+                    rapid,
+                    feed,
+                )
+        self._x0.append(self._cx)
+        self._x0.extend(xs[:-1])
+        self._y0.append(self._cy)
+        self._y0.extend(ys[:-1])
+        self._x1.extend(xs)
+        self._y1.extend(ys)
+        self._rapid.extend([1 if rapid else 0] * n)
+        self._feed.extend([math.nan if feed is None else float(feed)] * n)
+        self._cx, self._cy = xs[-1], ys[-1]
+
+    def animate_tracks(self, animate=False, fps=2048, title="XY Simulation", max_frames=2000, save_path=None):
         """
         移動履歴（tracks）をmatplotlibで可視化
         animate: Trueならアニメーション表示、Falseなら軌跡のみ
         fps: アニメーションのフレームレート
         title: グラフタイトル
+        max_frames: 総フレーム数の上限。超える場合は途中のフレームを間引く（None で無制限）
+        save_path: 指定するとウィンドウを出さずにアニメーションを .gif / .mp4 へ保存する
         """
+        # matplotlib は描画するときだけ読み込む（実機ジョブや --help の起動を軽くする）
         import matplotlib.animation as animation
+        import matplotlib.pyplot as plt
+        from matplotlib.collections import LineCollection
 
-        if not self.tracks:
+        if not self._x0:
             print("No tracks")
             return
 
-        xs = [p for s in self.tracks for p in (s[0], s[2])]
-        ys = [p for s in self.tracks for p in (s[1], s[3])]
-
-        xmin, xmax = min(xs), max(xs)
-        ymin, ymax = min(ys), max(ys)
+        x0, y0, x1, y1, rapid_mask = self._track_arrays()
+        xmin, xmax = float(min(x0.min(), x1.min())), float(max(x0.max(), x1.max()))
+        ymin, ymax = float(min(y0.min(), y1.min())), float(max(y0.max(), y1.max()))
         pad = 0.05 * max(xmax - xmin or 1, ymax - ymin or 1)
 
         fig, ax = plt.subplots()
@@ -194,48 +342,84 @@ class SimDriver(CncDriver):
         ax.axhline(0, color="0.6")
         ax.axvline(0, color="0.6")
 
-        if not animate:
-            for x0, y0, x1, y1, rapid, _ in self.tracks:
-                ax.plot([x0, x1], [y0, y1], ":" if rapid else "-", linewidth=1.2 if rapid else 2.0)
+        if not animate and save_path is None:
+            # 線分ごとに Line2D を作らず、切削/早送りの 2 つのコレクションで一括描画する。
+            segs = np.stack((np.column_stack((x0, y0)), np.column_stack((x1, y1))), axis=1)
+            ax.add_collection(LineCollection(segs[~rapid_mask], colors="C0", linestyles="-", linewidths=2.0))
+            ax.add_collection(LineCollection(segs[rapid_mask], colors="C1", linestyles=":", linewidths=1.2))
             plt.show()
             return
 
-        lines = []
-        for _ in self.tracks:
-            (ln,) = ax.plot([], [], "-", lw=2.0)
-            lines.append(ln)
+        # 完了済みの線分は切削/早送りの 2 つのコレクションにまとめ、フレーム毎には
+        # 表示する線分数（配列のスライス）と進行中の 1 本だけを更新する。
+        segs = np.stack((np.column_stack((x0, y0)), np.column_stack((x1, y1))), axis=1)
+        solid_segs = segs[~rapid_mask]
+        rapid_segs = segs[rapid_mask]
+        solid_lc = LineCollection([], colors="C0", linestyles="-", linewidths=2.0)
+        rapid_lc = LineCollection([], colors="C1", linestyles=":", linewidths=1.2)
+        ax.add_collection(solid_lc)
+        ax.add_collection(rapid_lc)
+        (tip,) = ax.plot([], [], "-", color="C0", lw=2.0)
+        artists = (solid_lc, rapid_lc, tip)
+        # 線分 i より前にある切削線分の数（早送りの数は i から引いて求める）
+        solid_before = np.concatenate(([0], np.cumsum(~rapid_mask))).tolist()
+        rapid_flags = rapid_mask.tolist()
+
+        # 各線分のフレーム数。間引き後に表示するフレームだけについて (線分番号, 進行中の先端座標)
+        # を配列で求め、全フレーム分の中間配列や Python オブジェクトは作らない。
+        steps = np.maximum(2, 5 + (np.hypot(x1 - x0, y1 - y0) * 2).astype(np.int64))
+        end_frame = np.cumsum(steps)
+        total = int(end_frame[-1])
+        stride = math.ceil(total / max_frames) if max_frames and total > max_frames else 1
+        shown_frames = np.arange(0, total, stride)
+        if shown_frames[-1] != total - 1:
+            shown_frames = np.append(shown_frames, total - 1)  # 最後の線分は必ず描き切る
+        seg_of_frame = np.searchsorted(end_frame, shown_frames, side="right")
+        t = (shown_frames - (end_frame - steps)[seg_of_frame] + 1) / steps[seg_of_frame]
+        tip_x = (x0[seg_of_frame] + (x1 - x0)[seg_of_frame] * t).tolist()
+        tip_y = (y0[seg_of_frame] + (y1 - y0)[seg_of_frame] * t).tolist()
+        seg_of_frame = seg_of_frame.tolist()
+        x0, y0 = x0.tolist(), y0.tolist()
+        shown = [0]  # コレクションに反映済みの線分数
 
-        steps = [max(2, 5 + int(math.hypot(s[2] - s[0], s[3] - s[1]) * 2)) for s in self.tracks]
+        def init():
+            solid_lc.set_segments([])
+            rapid_lc.set_segments([])
+            tip.set_data([], [])
+            shown[0] = 0
+            return artists
+
+        def update(k):
+            # k は間引き後のフレーム列での位置
+            i = seg_of_frame[k]
+            if i != shown[0]:
+                n_solid = solid_before[i]
+                solid_lc.set_segments(solid_segs[:n_solid])
+                rapid_lc.set_segments(rapid_segs[: i - n_solid])
+                shown[0] = i
+            if rapid_flags[i]:
+                tip.set_linestyle(":")
+                tip.set_color("C1")
+            else:
+                tip.set_linestyle("-")
+                tip.set_color("C0")
+            tip.set_data([x0[i], tip_x[k]], [y0[i], tip_y[k]])
+            return artists
 
-        def data_gen():
-            for i, (x0, y0, x1, y1, rapid, _) in enumerate(self.tracks):
-                n = steps[i]
-                for k in range(1, n + 1):
-                    t = k / n
-                    yield i, [x0, x0 + (x1 - x0) * t], [y0, y0 + (y1 - y0) * t]
+        frames = range(len(seg_of_frame))
 
-        def init():
-            for ln in lines:
-                ln.set_data([], [])
-            return lines
-
-        def update(fr):
-            i, xs_, ys_ = fr
-            for j in range(i):
-                x0, y0, x1, y1, rapid, _ = self.tracks[j]
-                lines[j].set_data([x0, x1], [y0, y1])
-                lines[j].set_linestyle(":" if rapid else "-")
-            rapid = self.tracks[i][4]
-            lines[i].set_data(xs_, ys_)
-            lines[i].set_linestyle(":" if rapid else "-")
-            return lines
+        if save_path is not None:
+            save_animation(fig, update, frames, save_path, fps=fps, init_func=init)
+            plt.close(fig)
+            return
 
         anim = animation.FuncAnimation(
             fig,
             update,
-            frames=data_gen(),
+            frames=frames,
             init_func=init,
-            blit=False,
+            # 返す 3 つのアーティストだけを背景の上に描き直す
+            blit=True,
             interval=1000 / fps,
             repeat=False,
             cache_frame_data=False,
@@ -257,25 +441,251 @@ def grid_circles(g, origin, area, cell, circle_d, feed, cw=False, dwell_ms=0, sn
     g.exec("G21 G90")
     g.exec(f"F{feed}")
     nx, ny = int(W // cell), int(H // cell)
+    if nx <= 0 or ny <= 0:
+        return
     base_cx, base_cy = ox + cell / 2.0, oy + cell / 2.0
-    for j in range(ny):
-        cols = range(nx) if (not snake or j % 2 == 0) else range(nx - 1, -1, -1)
-        for i in cols:
-            cx = base_cx + i * cell
-            cy = base_cy + j * cell
-            logging.debug(f"[DEBUG] grid_circles: center=({cx:.3f},{cy:.3f})")
-            g.exec(f"G0 X{cx:.3f} Y{cy:.3f}")
-            g.exec(f"G1 X{(cx + r):.3f} Y{cy:.3f}")
-            if cw:
-                g.exec(f"G2 X{(cx + r):.3f} Y{cy:.3f} I{-r:.3f} J0")
-            else:
-                g.exec(f"G3 X{(cx + r):.3f} Y{cy:.3f} I{-r:.3f} J0")
 
-            if dwell_ms > 0:
-                time.sleep(dwell_ms / 1000.0)
+    # 中心座標はまとめて配列で求め、スネーク走査は奇数行の列順反転で表す。
+    cols = np.tile(np.arange(nx), (ny, 1))
+    if snake:
+        cols[1::2] = cols[1::2, ::-1]
+    rows = np.repeat(np.arange(ny)[:, None], nx, axis=1)
+    centers_x = (base_cx + cols * cell).ravel().tolist()
+    centers_y = (base_cy + rows * cell).ravel().tolist()
+
+    # 座標はプロセス内で確定しているため、G-code 文字列を経由せず直接発行する。
+    debug = logging.getLogger().isEnabledFor(logging.DEBUG)
+    for cx, cy in zip(centers_x, centers_y):
+        if debug:
+            logging.debug("[DEBUG] grid_circles: center=(%.3f,%.3f)", cx, cy)
+        g.move(x=cx, y=cy, rapid=True)
+        g.move(x=cx + r, y=cy)
+        g.circle(cx, cy, r, cw=cw)
+
+        if dwell_ms > 0:
+            time.sleep(dwell_ms / 1000.0)
 
 
 # ---- NEW: SVG → moves ----
+# 3 次ベジェの制御点 (P0..P3) を t^3, t^2, t, 1 の係数へ写す行列
+_BEZIER_TO_POWER = np.array(
+    [
+        [-1.0, 3.0, -3.0, 1.0],
+        [3.0, -6.0, 3.0, 0.0],
+        [-3.0, 3.0, 0.0, 0.0],
+        [1.0, 0.0, 0.0, 0.0],
+    ]
+)
+
+
+def _path_ctrl(path):
+    """
+    SVG パスを float64 の制御点配列に展開する。
+
+    直線・2 次ベジェは次数上げで 3 次ベジェに揃え、(セグメント数, 4, 2) の ``ctrl`` と
+    各セグメントの元の次数 ``kinds``（1/2/3、円弧は 0）を返す。円弧の行は NaN のまま残す。
+    """
+    ctrl = np.full((len(path), 4, 2), np.nan)
+    kinds = np.zeros(len(path), dtype=np.int8)
+    for i, seg in enumerate(path):
+        bpoints = getattr(seg, "bpoints", None)
+        if bpoints is None:
+            continue
+        p = np.array([(z.real, z.imag) for z in bpoints()], dtype=np.float64)
+        kinds[i] = len(p) - 1
+        if len(p) == 2:
+            ctrl[i] = (p[0], (2 * p[0] + p[1]) / 3, (p[0] + 2 * p[1]) / 3, p[1])
+        elif len(p) == 3:
+            ctrl[i] = (p[0], p[0] + 2 * (p[1] - p[0]) / 3, p[2] + 2 * (p[1] - p[2]) / 3, p[2])
+        else:
+            ctrl[i] = p
+    return ctrl, kinds
+
+
+def _path_points(segs, ctrl, kinds, seg_idx, ts):
+    """
+    セグメント番号 seg_idx と媒介変数 ts（同じ長さの配列）に対応する点を (N, 2) 配列で返す。
+
+    ベジェは制御点を行列積で t のべき多項式の係数に直し、パス全体を Horner 法で一括評価する。
+    Python の complex は介さない。制御点を持たない円弧だけは svgpathtools の ``point`` を順に呼ぶ
+    （``segs`` はセグメント番号で円弧を引ける Path または dict）。
+    """
+    c = (_BEZIER_TO_POWER @ ctrl)[seg_idx]
+    t = ts[:, None]
+    pts = ((c[:, 0] * t + c[:, 1]) * t + c[:, 2]) * t + c[:, 3]
+    arc_rows = np.flatnonzero(kinds[seg_idx] == 0)
+    for r in arc_rows.tolist():
+        z = segs[int(seg_idx[r])].point(float(ts[r]))
+        pts[r] = (z.real, z.imag)
+    return pts
+
+
+# 制御多角形の長さが弦のこの倍率を超えるセグメントは、平均ではなく上限（制御多角形長）で見積もる
+_SVG_LENGTH_BOUND_RATIO = 1.1
+
+# SVG 折れ線キャッシュの既定の保存先
+SVG_CACHE_DIR = Path.home() / ".cache" / "xy_runner"
+
+# 折れ線化の結果が変わる変更（分割数の見積もり・曲線の評価・並べ替えなど）を入れたら上げる。
+# キャッシュのキーに含め、古いアルゴリズムで作った折れ線を読まないようにする。
+_SVG_CACHE_VERSION = 1
+
+
+def _tessellate_svg(
+    file_path, origin, px_to_mm, chord_mm, y_flip, svg_height_mm, sort_paths, high_accuracy=False, workers=1
+):
+    """
+    SVG のパスを機械座標 [mm] の折れ線（(N, 2) 配列）のリストに変換する。
+
+    workers が 2 以上ならパスごとのサンプリングをその数のプロセスで並列に行う。
+    """
+    try:
+        from svgpathtools import svg2paths
+    except Exception as e:
+        raise SystemExit("svgpathtools が必要です: pip install svgpathtools") from e
+
+    paths, attrs = svg2paths(str(file_path))
+
+    # 制御点は svg2paths の直後に一度だけ float64 へ取り出し、以降はこの配列だけで計算する
+    flat = [(path, *_path_ctrl(path)) for path in paths]
+
+    flat = [item for item in flat if len(item[0])]
+    if flat and y_flip and svg_height_mm is None:
+        raise SystemExit("y_flip=True の場合は svg_height_mm を指定してください")
+
+    # 早送りが短くなるよう、機械原点から始めて「今のペン位置に始点が最も近いパス」を順に選ぶ
+    if sort_paths and len(flat) > 1:
+        ox, oy = float(origin[0]), float(origin[1])
+        # 機械座標 (0, 0) を SVG 座標に戻したものを最初のペン位置とする
+        pen_y = (oy + svg_height_mm) / px_to_mm if y_flip else -oy / px_to_mm
+        starts = np.array([(p.start.real, p.start.imag) for p, _, _ in flat])
+        ends = np.array([(p.end.real, p.end.imag) for p, _, _ in flat])
+        order = _nearest_path_order(starts, ends, (-ox / px_to_mm, pen_y))
+        flat = [flat[i] for i in order]
+
+    # ワーカーへは制御点配列と、svgpathtools でしか扱えないセグメント（円弧、high_accuracy 時の曲線）
+    # だけを渡し、Path オブジェクト全体は送らない
+    jobs = [
+        (ctrl, kinds, {i: path[i] for i in np.flatnonzero(kinds != 1 if high_accuracy else kinds == 0).tolist()})
+        for path, ctrl, kinds in flat
+    ]
+    sample = partial(
+        _sample_path,
+        origin=(float(origin[0]), float(origin[1])),
+        px_to_mm=px_to_mm,
+        chord_mm=chord_mm,
+        y_flip=y_flip,
+        svg_height_mm=svg_height_mm,
+        high_accuracy=high_accuracy,
+    )
+    if workers > 1 and len(jobs) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+
+        # パス同士は独立なのでプロセス単位で並列に折れ線化し、結果は元の順序で受け取る
+        with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+            return list(pool.map(sample, *zip(*jobs), chunksize=max(1, len(jobs) // (workers * 4))))
+    return [sample(ctrl, kinds, segs) for ctrl, kinds, segs in jobs]
+
+
+def _nearest_path_order(starts, ends, pen):
+    """
+    始点列 starts・終点列 ends（各 (N, 2)）のパスを、ペン位置 pen から貪欲な最近傍法で並べた添字を返す。
+
+    各ステップで未訪問の始点までの距離を配列で一括計算し、選んだパスの終点を次のペン位置にする。
+    """
+    n = len(starts)
+    remaining = np.ones(n, dtype=bool)
+    order = []
+    px, py = pen
+    for _ in range(n):
+        d = np.where(remaining, (starts[:, 0] - px) ** 2 + (starts[:, 1] - py) ** 2, np.inf)
+        k = int(np.argmin(d))
+        order.append(k)
+        remaining[k] = False
+        px, py = ends[k]
+    return order
+
+
+def _sample_path(ctrl, kinds, segs, *, origin, px_to_mm, chord_mm, y_flip, svg_height_mm, high_accuracy):
+    """
+    1 本のパスを chord_mm 間隔でサンプリングし、機械座標 [mm] の (N, 2) 配列を返す。
+
+    ``segs`` はセグメント番号 → svgpathtools のセグメントで、円弧（と high_accuracy 時の曲線）のみ含む。
+    プロセスプールからも呼べるよう、モジュールレベルの関数にしている。
+    """
+    # 長さは分割数を決めるだけなので、弦（下限）と制御多角形（上限）の平均で見積もる
+    # 直線では両者が一致して厳密になる。曲がりの強いセグメントは上限の制御多角形長を使い、
+    # 円弧は長い方の半径×中心角で見積もる。high_accuracy のときだけ数値積分に任せる
+    chord = np.hypot(*(ctrl[:, 3] - ctrl[:, 0]).T)
+    polygon = np.hypot(*np.diff(ctrl, axis=1).transpose(2, 0, 1)).sum(axis=1)
+    curved = ~(polygon <= _SVG_LENGTH_BOUND_RATIO * chord)
+    seg_len_px = np.where(curved, polygon, 0.5 * (chord + polygon))
+    for i in np.flatnonzero(kinds == 0).tolist():
+        arc = segs[i]
+        seg_len_px[i] = max(abs(arc.radius.real), abs(arc.radius.imag)) * math.radians(abs(arc.delta))
+    if high_accuracy:
+        for i in np.flatnonzero((kinds == 0) | curved).tolist():
+            seg_len_px[i] = segs[i].length(error=1e-5)
+    seg_len_mm = np.maximum(1e-9, seg_len_px) * px_to_mm
+    steps = np.maximum(1, np.ceil(seg_len_mm / max(1e-6, chord_mm)).astype(np.int64))
+    seg_idx = np.repeat(np.arange(len(ctrl)), steps + 1)
+    # セグメントごとに 0..steps を並べ、steps で割って t を作る
+    offsets = np.repeat(np.cumsum(steps + 1) - (steps + 1), steps + 1)
+    ts = (np.arange(len(seg_idx)) - offsets) / steps[seg_idx]
+    pts = _path_points(segs, ctrl, kinds, seg_idx, ts)
+    xs = pts[:, 0] * px_to_mm
+    ys = pts[:, 1] * px_to_mm
+    if y_flip:
+        ys = svg_height_mm - ys
+    ox, oy = origin
+    return np.column_stack((ox + xs, oy + ys))
+
+
+def _svg_cache_file(cache_dir, file_path, params):
+    """SVG ファイルの更新時刻・サイズと変換パラメータから、キャッシュファイルのパスを決める。"""
+    import hashlib
+
+    resolved = Path(file_path).resolve()
+    st = resolved.stat()
+    key = "|".join([str(resolved), str(st.st_mtime_ns), str(st.st_size)] + [repr(v) for v in params])
+    digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).hexdigest()
+    return Path(cache_dir).expanduser() / f"{digest}.npy"
+
+
+def _load_svg_cache(cache_file):
+    """キャッシュ（各行 x, y, パス番号）を折れ線のリストに戻す。読めなければ None。"""
+    try:
+        data = np.load(cache_file, allow_pickle=False)
+    except (OSError, ValueError):
+        return None
+    if data.ndim != 2 or data.shape[1] != 3:
+        return None
+    breaks = np.flatnonzero(np.diff(data[:, 2])) + 1
+    return [chunk for chunk in np.split(data[:, :2], breaks) if len(chunk)]
+
+
+def _save_svg_cache(cache_file, polylines):
+    """折れ線のリストを (N, 3) 配列として保存する。失敗しても処理は続ける。"""
+    if polylines:
+        data = np.concatenate(
+            [np.column_stack((pl, np.full(len(pl), i, dtype=float))) for i, pl in enumerate(polylines)]
+        )
+    else:
+        data = np.empty((0, 3))
+    tmp = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp, "wb") as fh:
+            np.save(fh, data, allow_pickle=False)
+        os.replace(tmp, cache_file)
+    except OSError as exc:
+        logging.warning("SVG キャッシュを保存できませんでした: %s (%s)", cache_file, exc)
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+
+
 def svg_to_moves(
     g,
     file_path,
@@ -286,6 +696,9 @@ def svg_to_moves(
     y_flip=False,
     svg_height_mm=None,
     sort_paths=False,
+    cache_dir=None,
+    high_accuracy=False,
+    workers=1,
 ):
     """
     file_path: SVGファイルパス（PowerPoint からエクスポートしたもの想定）
@@ -295,63 +708,54 @@ def svg_to_moves(
     feed: 送り [mm/min]
     y_flip: TrueならY軸反転（SVGのYダウン→機械のYアップ）。その際 svg_height_mm が必要。
     svg_height_mm: y_flipする場合の原図の高さ[mm]（viewBox高さ×px_to_mm）
-    sort_paths: 左上→右下の順に粗く並べ替え（移動効率を少し改善）
+    sort_paths: 機械原点から最近傍法でパスを並べ替え、早送りの移動距離を減らす
+    cache_dir: 指定すると折れ線化の結果をこのディレクトリに保存し、ファイルと上記パラメータが
+        同じ次回以降は SVG の解析を省く
+    high_accuracy: True なら曲がりの強い曲線と円弧の分割数を数値積分した長さから決める
+        （既定は制御多角形長・半径×中心角による上限見積もり）
+    workers: 2 以上なら折れ線化をパス単位でその数のプロセスに分担させる（0 で CPU 数）。
+        パスが多い SVG 向けで、結果は逐次処理と同じ
     """
-    try:
-        from svgpathtools import svg2paths
-    except Exception as e:
-        raise SystemExit("svgpathtools が必要です: pip install svgpathtools") from e
-
+    workers = int(workers) if workers else (os.cpu_count() or 1)
     if not os.path.exists(file_path):
         raise SystemExit(f"SVG not found: {file_path}")
 
-    paths, attrs = svg2paths(file_path)
-
-    # 粗い並び替え（左上→右下）
-    if sort_paths:
-
-        def path_key(p):
-            xs = []
-            ys = []
-            for seg in p:
-                for t in (0.0, 0.5, 1.0):
-                    z = seg.point(t)
-                    xs.append(z.real)
-                    ys.append(z.imag)
-
-            return (min(xs), min(ys))
-
-        paths = sorted(paths, key=path_key)
+    params = (
+        _SVG_CACHE_VERSION,
+        (float(origin[0]), float(origin[1])),
+        px_to_mm,
+        chord_mm,
+        bool(y_flip),
+        svg_height_mm,
+        "nearest" if sort_paths else None,
+        bool(high_accuracy),
+    )
+    polylines = None
+    cache_file = None
+    if cache_dir is not None:
+        cache_file = _svg_cache_file(cache_dir, file_path, params)
+        polylines = _load_svg_cache(cache_file)
+        if polylines is not None:
+            logging.debug("[DEBUG] svg_to_moves: cache hit %s", cache_file)
+    if polylines is None:
+        polylines = _tessellate_svg(
+            file_path, origin, px_to_mm, chord_mm, y_flip, svg_height_mm, sort_paths, high_accuracy, workers
+        )
+        if cache_file is not None:
+            _save_svg_cache(cache_file, polylines)
 
     g.exec("G21 G90")
     g.exec(f"F{feed}")
-    ox, oy = origin
 
-    for path in paths:
-        # 各セグメントを chord_mm でサンプリング
-        pts = []
-        for seg in path:
-            seg_len_px = max(1e-9, seg.length(error=1e-5))
-            seg_len_mm = seg_len_px * px_to_mm
-            steps = max(1, int(math.ceil(seg_len_mm / max(1e-6, chord_mm))))
-            for k in range(0, steps + 1):
-                t = k / steps
-                z = seg.point(t)
-                x_mm = z.real * px_to_mm
-                y_mm = z.imag * px_to_mm
-                if y_flip:
-                    if svg_height_mm is None:
-                        raise SystemExit("y_flip=True の場合は svg_height_mm を指定してください")
-                    y_mm = svg_height_mm - y_mm
-                pts.append((ox + x_mm, oy + y_mm))
-        if not pts:
-            continue
-        logging.debug(f"[DEBUG] svg_to_moves: path_points={pts}")
+    # 座標は確定済みのため、G-code 文字列を経由せずパス毎にまとめて発行する
+    debug = logging.getLogger().isEnabledFor(logging.DEBUG)
+    for polyline in polylines:
+        if debug:
+            logging.debug("[DEBUG] svg_to_moves: path_points=%s", polyline)
         # サブパス開始点へ早送りしてから描画
-        sx, sy = pts[0]
-        g.exec(f"G0 X{sx:.3f} Y{sy:.3f}")
-        for x, y in pts[1:]:
-            g.exec(f"G1 X{float(x):.3f} Y{float(y):.3f}")
+        sx, sy = polyline[0].tolist()
+        g.move(x=sx, y=sy, rapid=True)
+        g.exec_moves_abs(polyline[1:, 0], polyline[1:, 1])
 
 
 class GridCirclesJob(Job):
@@ -411,6 +815,15 @@ class SvgJob(Job):
         if svg_height_mm is not None:
             svg_height_mm = float(svg_height_mm)
         sort_paths = bool(self.config.get("sort_paths", False))
+        high_accuracy = bool(self.config.get("high_accuracy", False))
+        workers = self.config.get("workers", 1)
+        try:
+            workers = int(workers)
+        except (TypeError, ValueError) as exc:
+            raise SystemExit(f"workers には整数を指定してください: {workers!r}") from exc
+        # cache: true で既定の保存先、文字列ならそのディレクトリに折れ線化の結果をキャッシュする
+        cache = self.config.get("cache", False)
+        cache_dir = SVG_CACHE_DIR if cache is True else (cache or None)
         svg_to_moves(
             gcode,
             file_path=file_path,
@@ -421,6 +834,9 @@ class SvgJob(Job):
             y_flip=y_flip,
             svg_height_mm=svg_height_mm,
             sort_paths=sort_paths,
+            cache_dir=cache_dir,
+            high_accuracy=high_accuracy,
+            workers=workers,
         )
 
 
@@ -449,6 +865,7 @@ class XYRunnerApp:
             str(config_path),
             driver_override=self.args.driver,
         )
+        _resolve_relative.cache_clear()  # 設定を読み直したらパス解決の結果も捨てる
         config_dir = config_path.resolve().parent
 
         driver, driver_name = self._create_driver(cfg)
@@ -495,6 +912,14 @@ class XYRunnerApp:
             gcode.exec("G91")
         if "feed" in defaults:
             gcode.exec(f"F{float(defaults['feed'])}")
+        if "arc_tolerance_mm" in defaults:
+            try:
+                tolerance = float(defaults["arc_tolerance_mm"])
+            except (TypeError, ValueError) as exc:
+                raise SystemExit(f"arc_tolerance_mm には数値を指定してください: {defaults['arc_tolerance_mm']!r}") from exc
+            if tolerance <= 0:
+                raise SystemExit("arc_tolerance_mm は正の数値で指定してください。")
+            gcode.arc_tolerance_mm = tolerance
 
     def _finalize(self, driver_name: str, driver: CncDriver, cfg: dict) -> None:
         vis = cfg.get("visual", {})
@@ -524,8 +949,6 @@ class XYRunnerApp:
 
 
 def select_config_interactive():
-    import glob
-
     runner_dir = Path(__file__).resolve().parent
     # Look in multiple locations: current working dir, runner dir, and common examples
     repo_root = runner_dir.parents[1]
@@ -539,12 +962,16 @@ def select_config_interactive():
         repo_root / "examples" / "example_xy",
     ]
 
-    candidates = []
-    for directory in dict.fromkeys(search_dirs):  # preserve order, drop duplicates
-        pattern = str(directory / "*.yaml")
-        candidates.extend(glob.glob(pattern))
+    # ディレクトリ側を一度だけ正規化して重複を除き、各ディレクトリは scandir 1 回で走査する
+    candidates = set()
+    for directory in dict.fromkeys(d.resolve() for d in search_dirs):
+        try:
+            with os.scandir(directory) as it:
+                candidates.update(e.path for e in it if e.name.endswith(".yaml") and e.is_file())
+        except OSError:
+            continue
 
-    all_yaml = sorted({Path(f).resolve() for f in candidates})
+    all_yaml = sorted(Path(f) for f in candidates)
     if not all_yaml:
         print("YAML設定ファイルが見つかりません。")
         sys.exit(1)
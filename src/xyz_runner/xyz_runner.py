@@ -9,10 +9,12 @@ Dependencies:
   pip install pyyaml matplotlib pyserial numpy svgpathtools pythonocc-core
 """
 import argparse
+import array
 import logging
 import math
 import os
 import sys
+from functools import lru_cache
 from pathlib import Path
 from typing import Mapping, Optional
 
@@ -23,13 +25,18 @@ if src_str in sys.path:
     sys.path.remove(src_str)
 sys.path.insert(0, src_str)
 
-import matplotlib.pyplot as plt
+import numpy as np
 
 from common.drivers import CncDriver, ChuoDriver
 from common.gcode import LinearGCodeInterpreter, ModalState3D
 from common.jobs import Job, JobFactory
 from common.platform import EnvironmentAdapter
-from common.runtime import ConfigLoader, JobDispatcher, VisualizationController
+from common.runtime import ConfigLoader, JobDispatcher, VisualizationController, save_animation
+
+
+# 生成する G-code 行のテンプレート（Zワードは呼び出し側で連結）
+_G0_XY = "G0 X{:.3f} Y{:.3f} ".format
+_G1_XY = "G1 X{:.3f} Y{:.3f} ".format
 
 
 def _resolve_resource_path(file_entry: str, context: Mapping[str, object]) -> Path:
@@ -37,18 +44,23 @@ def _resolve_resource_path(file_entry: str, context: Mapping[str, object]) -> Pa
     if path.is_absolute():
         return path
 
-    config_dir = Path(context.get("config_dir", Path.cwd()))
-    project_root = Path(context.get("project_root", config_dir))
-    candidates = []
-    for base in (config_dir, config_dir.parent, project_root):
-        if base and base not in candidates:
-            candidates.append(base)
+    config_dir = str(context.get("config_dir", Path.cwd()))
+    project_root = str(context.get("project_root", config_dir))
+    return Path(_resolve_relative(file_entry, config_dir, project_root))
 
-    for base in candidates:
-        candidate = (base / file_entry).resolve()
-        if candidate.exists():
-            return candidate
-    return (config_dir / file_entry).resolve()
+
+@lru_cache(maxsize=256)
+def _resolve_relative(file_entry: str, config_dir: str, project_root: str) -> str:
+    """
+    相対パスを設定ディレクトリ → その親 → プロジェクトルートの順に探す。
+
+    同じ組み合わせの解決結果は覚えておき、stat の繰り返しを避ける。設定を読み直したら
+    ``_resolve_relative.cache_clear()`` で破棄する。
+    """
+    base_dir = Path(config_dir)
+    bases = dict.fromkeys((base_dir, base_dir.parent, Path(project_root)))
+    found = next((c for c in ((base / file_entry).resolve() for base in bases) if c.exists()), None)
+    return str(found or (base_dir / file_entry).resolve())
 
 
 # ========= 共通（簡易Gコードラッパ：直線/円弧/3D） =========
@@ -56,10 +68,10 @@ class GCodeWrapper3D(LinearGCodeInterpreter):
     modal_state_cls = ModalState3D
     linear_axes = ("X", "Y", "Z")
     extra_params = ("I", "J", "K")
-    motion_g_codes = (0, 1)
+    motion_g_codes = frozenset({0, 1})
 
-    def _handle_extended_motion(self, gcode, params, words):
-        super()._handle_extended_motion(gcode, params, words)
+    def _handle_extended_motion(self, gcode, params):
+        super()._handle_extended_motion(gcode, params)
 
 
 class GcodeFileJob(Job):
@@ -157,6 +169,7 @@ class XYZRunnerApp:
             str(config_path) if config_path else None,
             driver_override=self.args.driver,
         )
+        _resolve_relative.cache_clear()  # 設定を読み直したらパス解決の結果も捨てる
         if selected_file:
             cfg["selected_file"] = selected_file
 
@@ -294,11 +307,29 @@ class SimDriver3D(CncDriver):
     axes = ("x", "y", "z")
 
     def __init__(self):
-        self.tracks = []  # 移動履歴（(x0,y0,z0,x1,y1,z1,rapid,feed)）
+        # 移動履歴は列ごとの連続配列（SoA）で保持する。feed 未指定は NaN で表す。
+        self._x0 = array.array("d")
+        self._y0 = array.array("d")
+        self._z0 = array.array("d")
+        self._x1 = array.array("d")
+        self._y1 = array.array("d")
+        self._z1 = array.array("d")
+        self._rapid = array.array("b")
+        self._feed = array.array("d")
+        # move_abs 毎のレベル判定を避けるため、ログ設定後に生成される前提で一度だけ判定しておく
+        self._debug = logging.getLogger().isEnabledFor(logging.DEBUG)
         self._cx = 0.0
         self._cy = 0.0
         self._cz = 0.0
 
+    @property
+    def tracks(self):
+        """移動履歴（(x0,y0,z0,x1,y1,z1,rapid,feed)）のリスト。互換用に都度組み立てる。"""
+        feeds = [None if f != f else f for f in self._feed]
+        return list(
+            zip(self._x0, self._y0, self._z0, self._x1, self._y1, self._z1, map(bool, self._rapid), feeds)
+        )
+
     def set_units_mm(self):
         pass
 
@@ -315,41 +346,53 @@ class SimDriver3D(CncDriver):
         nx = self._cx if x_val is None else float(x_val)
         ny = self._cy if y_val is None else float(y_val)
         nz = self._cz if z_val is None else float(z_val)
-        logging.debug(
-            "[DEBUG] SimDriver3D.move_abs: from=(%s,%s,%s) to=(%s,%s,%s), rapid=%s, feed=%s",
-            self._cx,
-            self._cy,
-            self._cz,
-            nx,
-            ny,
-            nz,
-            rapid,
-            feed,
-        )
-        self.tracks.append((self._cx, self._cy, self._cz, nx, ny, nz, rapid, feed))
+        if self._debug:
+            logging.debug(
+                "[DEBUG] SimDriver3D.move_abs: from=(%s,%s,%s) to=(%s,%s,%s), rapid=%s, feed=%s",
+                self._cx,
+                self._cy,
+                self._cz,
+                nx,
+                ny,
+                nz,
+                rapid,
+                feed,
+            )
+        self._x0.append(self._cx)
+        self._y0.append(self._cy)
+        self._z0.append(self._cz)
+        self._x1.append(nx)
+        self._y1.append(ny)
+        self._z1.append(nz)
+        self._rapid.append(1 if rapid else 0)
+        self._feed.append(math.nan if feed is None else float(feed))
         self._cx, self._cy, self._cz = nx, ny, nz
 
-    def animate_tracks(self, animate=True, fps=1080, title="XYZ Simulation"):
+    def animate_tracks(self, animate=True, fps=1080, title="XYZ Simulation", max_frames=2000, save_path=None):
         """
         移動履歴（tracks）を3Dでmatplotlibで可視化
         animate: Trueならアニメーション表示、Falseなら軌跡のみ
         fps: アニメーションのフレームレート
         title: グラフタイトル
+        max_frames: 総フレーム数の上限。超える場合は途中のフレームを間引く（None で無制限）
+        save_path: 指定するとウィンドウを出さずにアニメーションを .gif / .mp4 へ保存する
         """
+        # matplotlib は描画するときだけ読み込む（実機ジョブや --help の起動を軽くする）
         import matplotlib.animation as animation
+        import matplotlib.pyplot as plt
 
-        if not self.tracks:
+        if not self._x0:
             print("No tracks")
             return
 
-        # 座標範囲を計算
-        xs = [p for s in self.tracks for p in (s[0], s[3])]
-        ys = [p for s in self.tracks for p in (s[1], s[4])]
-        zs = [p for s in self.tracks for p in (s[2], s[5])]
-
-        xmin, xmax = min(xs), max(xs)
-        ymin, ymax = min(ys), max(ys)
-        zmin, zmax = min(zs), max(zs)
+        # 始点・終点は (3, N) の配列にまとめ、範囲・分割数・フレーム座標を一括で求める
+        starts = np.array([self._x0, self._y0, self._z0])
+        ends = np.array([self._x1, self._y1, self._z1])
+        rapid_mask = np.array(self._rapid, dtype=bool)
+        lo = np.minimum(starts.min(axis=1), ends.min(axis=1)).tolist()
+        hi = np.maximum(starts.max(axis=1), ends.max(axis=1)).tolist()
+        xmin, ymin, zmin = lo
+        xmax, ymax, zmax = hi
         pad = 0.05 * max(xmax - xmin or 1, ymax - ymin or 1, zmax - zmin or 1)
 
         fig = plt.figure(figsize=(10, 8))
@@ -363,62 +406,82 @@ class SimDriver3D(CncDriver):
         ax.set_title(title)
         ax.grid(True, alpha=0.3)
 
-        if not animate:
-            # 静的表示
-            for x0, y0, z0, x1, y1, z1, rapid, _ in self.tracks:
-                ax.plot(
-                    [x0, x1],
-                    [y0, y1],
-                    [z0, z1],
-                    ":" if rapid else "-",
-                    linewidth=1.2 if rapid else 2.0,
-                    alpha=0.8,
-                )
+        # 線分ごとに Line3D を作らず、切削/早送りの 2 つのコレクションで一括描画する
+        from mpl_toolkits.mplot3d.art3d import Line3DCollection
+
+        segs = np.stack((starts.T, ends.T), axis=1)
+        if not animate and save_path is None:
+            # 静的表示（add_collection3d は空のコレクションを受け付けないため、線分がある方だけ追加する）
+            for mask, color, style, width in ((~rapid_mask, "C0", "-", 2.0), (rapid_mask, "C1", ":", 1.2)):
+                if mask.any():
+                    ax.add_collection3d(Line3DCollection(segs[mask], colors=color, linestyles=style, linewidths=width))
             plt.show()
             return
 
-        # アニメーション表示
-        lines = []
-        for _ in self.tracks:
-            (ln,) = ax.plot([], [], [], "-", lw=2.0, alpha=0.8)
-            lines.append(ln)
-
-        # 各線分のステップ数を計算
-        steps = []
-        for x0, y0, z0, x1, y1, z1, rapid, _ in self.tracks:
-            dist = math.sqrt((x1 - x0) ** 2 + (y1 - y0) ** 2 + (z1 - z0) ** 2)
-            step_count = max(3, int(dist * 2) + 5)  # 距離に応じてステップ数調整
-            steps.append(step_count)
+        # アニメーション表示: 完了済みの線分は 2 つのコレクションの表示本数で表し、
+        # フレーム毎には進行中の 1 本だけを更新する
+        solid_segs = segs[~rapid_mask]
+        rapid_segs = segs[rapid_mask]
+        # 空の線分列では add_collection3d が失敗するため全線分で作って追加し、init で空にする
+        solid_lc = Line3DCollection(solid_segs, colors="blue", linestyles="-", linewidths=2.0, alpha=0.8)
+        rapid_lc = Line3DCollection(rapid_segs, colors="gray", linestyles=":", linewidths=2.0, alpha=0.8)
+        for lc, part in ((solid_lc, solid_segs), (rapid_lc, rapid_segs)):
+            if len(part):
+                ax.add_collection3d(lc)
+        (tip,) = ax.plot([], [], [], "-", lw=2.0, alpha=0.8)
+        artists = [solid_lc, rapid_lc, tip]
+        # 線分 i より前にある切削線分の数（早送りの数は i から引いて求める）
+        solid_before = np.concatenate(([0], np.cumsum(~rapid_mask))).tolist()
+
+        # 各線分のステップ数（距離に応じて調整）とフレームごとの先端座標を配列で用意する
+        steps = np.maximum(3, (np.linalg.norm(ends - starts, axis=0) * 2).astype(np.int64) + 5)
+        seg_of_frame = np.repeat(np.arange(len(steps)), steps)
+        total = len(seg_of_frame)
+        stride = math.ceil(total / max_frames) if max_frames and total > max_frames else 1
+        # 間引き時も最後のフレームは必ず出す
+        shown_frames = np.arange(0, total, stride)
+        if shown_frames[-1] != total - 1:
+            shown_frames = np.append(shown_frames, total - 1)
+        seg_of_frame = seg_of_frame[shown_frames]
+        first_frame = np.cumsum(steps) - steps
+        t = (shown_frames - first_frame[seg_of_frame] + 1) / steps[seg_of_frame]
+        tips = starts[:, seg_of_frame] + (ends - starts)[:, seg_of_frame] * t
+        seg_of_frame = seg_of_frame.tolist()
+        tips = tips.T.tolist()
+        starts_l = starts.T.tolist()
+        rapid_flags = rapid_mask.tolist()
+        done = [0]  # コレクションに反映済みの線分数
 
         def data_gen():
-            for i, (x0, y0, z0, x1, y1, z1, rapid, _) in enumerate(self.tracks):
-                n = steps[i]
-                for k in range(1, n + 1):
-                    t = k / n
-                    x = x0 + (x1 - x0) * t
-                    y = y0 + (y1 - y0) * t
-                    z = z0 + (z1 - z0) * t
-                    yield i, [x0, x], [y0, y], [z0, z], rapid
+            for i, (x, y, z) in zip(seg_of_frame, tips):
+                x0, y0, z0 = starts_l[i]
+                yield i, [x0, x], [y0, y], [z0, z], rapid_flags[i]
 
         def init():
-            for ln in lines:
-                ln.set_data_3d([], [], [])
-            return lines
+            solid_lc.set_segments([])
+            rapid_lc.set_segments([])
+            tip.set_data_3d([], [], [])
+            done[0] = 0
+            return artists
 
         def update(data):
             i, xs_, ys_, zs_, rapid = data
-            # 過去の線分を描画（完了済み）
-            for j in range(i):
-                x0, y0, z0, x1, y1, z1, r, _ = self.tracks[j]
-                lines[j].set_data_3d([x0, x1], [y0, y1], [z0, z1])
-                lines[j].set_linestyle(":" if r else "-")
-                lines[j].set_color("gray" if r else "blue")
+            # 過去の線分を描画（完了済み）。線分が進んだときだけコレクションを更新する
+            if i != done[0]:
+                n_solid = solid_before[i]
+                solid_lc.set_segments(solid_segs[:n_solid])
+                rapid_lc.set_segments(rapid_segs[: i - n_solid])
+                done[0] = i
             # 現在の線分を描画（進行中）
-            if i < len(lines):
-                lines[i].set_data_3d(xs_, ys_, zs_)
-                lines[i].set_linestyle(":" if rapid else "-")
-                lines[i].set_color("red" if rapid else "green")
-            return lines
+            tip.set_data_3d(xs_, ys_, zs_)
+            tip.set_linestyle(":" if rapid else "-")
+            tip.set_color("red" if rapid else "green")
+            return artists
+
+        if save_path is not None:
+            save_animation(fig, update, data_gen(), save_path, fps=fps, init_func=init)
+            plt.close(fig)
+            return
 
         anim = animation.FuncAnimation(
             fig,
@@ -454,6 +517,7 @@ def grid_spheres_3d(g, origin, area, cell, sphere_d, feed, levels=3):
     ox, oy, oz = origin
     W, H, D = area
     r = sphere_d / 2.0
+    cos, sin, tau = math.cos, math.sin, 2 * math.pi
 
     g.exec("G21 G90")  # mm, absolute
     g.exec(f"F{feed}")
@@ -465,6 +529,7 @@ def grid_spheres_3d(g, origin, area, cell, sphere_d, feed, levels=3):
     print(f"3Dグリッド: {nx}x{ny}x{nz} = {nx*ny*nz}個の球体 (Z=0から開始)")
 
     total_spheres = 0
+    debug = logging.getLogger().isEnabledFor(logging.DEBUG)
     for k in range(nz):  # Z方向
         for j in range(ny):  # Y方向
             for i in range(nx):  # X方向
@@ -472,7 +537,8 @@ def grid_spheres_3d(g, origin, area, cell, sphere_d, feed, levels=3):
                 cy = base_cy + j * cell
                 cz = base_cz + k * cell
 
-                logging.debug(f"[DEBUG] grid_spheres_3d: center=({cx:.3f},{cy:.3f},{cz:.3f})")
+                if debug:
+                    logging.debug("[DEBUG] grid_spheres_3d: center=(%.3f,%.3f,%.3f)", cx, cy, cz)
 
                 # 球体をZ方向のレベルで分割（Z=0から上方向）
                 for level in range(levels):
@@ -486,22 +552,18 @@ def grid_spheres_3d(g, origin, area, cell, sphere_d, feed, levels=3):
                         if circle_r > 0.5:  # 最小半径
                             steps = max(6, int(circle_r * 4))
 
+                            # 最初のレベルは必ずZ=0（Zワードはレベル内で共通）
+                            z_word = "Z0" if level == 0 else f"Z{z_pos:.3f}"
+
                             # 円の開始点へ移動
-                            if level == 0:
-                                g.exec(f"G0 X{cx + circle_r:.3f} Y{cy:.3f} Z0")  # 最初は必ずZ=0
-                            else:
-                                g.exec(f"G0 X{cx + circle_r:.3f} Y{cy:.3f} Z{z_pos:.3f}")
+                            g.exec(_G0_XY(cx + circle_r, cy) + z_word)
 
                             # XY平面で円を描画
                             for step in range(steps + 1):
-                                angle = 2 * math.pi * step / steps
-                                x = cx + circle_r * math.cos(angle)
-                                y = cy + circle_r * math.sin(angle)
-
-                                if level == 0:
-                                    g.exec(f"G1 X{x:.3f} Y{y:.3f} Z0")  # 最初のレベルはZ=0
-                                else:
-                                    g.exec(f"G1 X{x:.3f} Y{y:.3f} Z{z_pos:.3f}")
+                                angle = tau * step / steps
+                                x = cx + circle_r * cos(angle)
+                                y = cy + circle_r * sin(angle)
+                                g.exec(_G1_XY(x, y) + z_word)
 
                 total_spheres += 1
 
@@ -542,6 +604,7 @@ def process_step_file_simple(g, file_path, origin, resolution):
     実際の実装では pythonocc-core を使用
     """
     ox, oy, oz = origin
+    cos, sin, tau = math.cos, math.sin, 2 * math.pi
     with open(file_path, "r", encoding="utf-8") as f:
         content = f.read()
 
@@ -634,23 +697,19 @@ def process_step_file_simple(g, file_path, origin, resolution):
                     # XY平面で円を描画
                     steps = max(8, int(circle_r * 6))
 
+                    # 最初のレベル（Z=0）は常にZ=0で描画
+                    z_word = "Z0" if level == 0 else f"Z{z_pos:.3f}"
+
                     # Z=0から開始する場合の特別処理
                     if level == 0:
                         print(f"  Z=0レベルから開始: 半径={circle_r:.2f}mm")
-                        g.exec(f"G0 X{cx + circle_r:.3f} Y{cy:.3f} Z0")  # Z=0から開始
-                    else:
-                        g.exec(f"G0 X{cx + circle_r:.3f} Y{cy:.3f} Z{z_pos:.3f}")
+                    g.exec(_G0_XY(cx + circle_r, cy) + z_word)
 
                     for step in range(steps + 1):
-                        angle = 2 * math.pi * step / steps
-                        x = cx + circle_r * math.cos(angle)
-                        y = cy + circle_r * math.sin(angle)
-
-                        # 最初のレベル（Z=0）は常にZ=0で描画
-                        if level == 0:
-                            g.exec(f"G1 X{x:.3f} Y{y:.3f} Z0")
-                        else:
-                            g.exec(f"G1 X{x:.3f} Y{y:.3f} Z{z_pos:.3f}")
+                        angle = tau * step / steps
+                        x = cx + circle_r * cos(angle)
+                        y = cy + circle_r * sin(angle)
+                        g.exec(_G1_XY(x, y) + z_word)
 
 
 def select_file_with_dialog(env: EnvironmentAdapter, title, filetypes):
@@ -663,12 +722,7 @@ def select_file_with_dialog(env: EnvironmentAdapter, title, filetypes):
 
 def select_and_execute_file(env: EnvironmentAdapter):
     """ファイルダイアログでG-codeまたはSTEPファイルを選択して実行"""
-    info = env.get_platform_info()
-    platform_name = {
-        "windows": "Windows",
-        "darwin": "macOS",
-        "linux": "Linux",
-    }.get(info["system"], info["system"].title())
+    platform_name = env.get_platform_info()["name"]
 
     print(f"\n=== XYZ Runner (3D) - {platform_name} ===")
     print("G-codeまたはSTEPファイルを選択してください...")